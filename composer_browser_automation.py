@@ -6,22 +6,27 @@ with Google Managed Composer (Airflow) to capture screenshots of DAG runs.
 """
 
 import os
-import time
+import json
+import atexit
+import base64
 import logging
+import shutil
+import tempfile
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
+# Only the lightweight exception classes are imported eagerly; selenium.webdriver,
+# webdriver_manager and requests are imported where used so that importing this
+# module (e.g. during an Airflow DAG folder scan) stays cheap.
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
 from dotenv import load_dotenv
 
 # Load environment variables from .env file (if exists)
 load_dotenv()
 
+# Silence webdriver-manager's own logging; must be set before it is imported
+os.environ.setdefault("WDM_LOG_LEVEL", "0")
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,41 +34,211 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Resolved ChromeDriver path is cached here so setup_driver doesn't hit the network every run
+DRIVER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "airflow-ai", "chromedriver.json")
+
+# Chrome flags: container-safe basics plus switching off subsystems that screenshots don't need
+CHROME_FLAGS = (
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--window-size=1920,1080",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-translate",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--disable-features=TranslateUI,BackForwardCache",
+)
+
+# Screenshot formats: file extension and Page.captureScreenshot params (None means Selenium's native PNG)
+SCREENSHOT_FORMATS = {
+    "png": ("png", None),
+    "jpeg": ("jpg", {"format": "jpeg", "quality": 85}),
+    "webp": ("webp", {"format": "webp", "quality": 80}),
+}
+
+# Directory screenshots are saved to; created once per process
+SCREENSHOT_DIR = os.getenv("SCREENSHOT_DIR", os.path.join(os.getcwd(), "screenshots"))
+os.makedirs(SCREENSHOT_DIR, exist_ok=True)
+
+# Screenshots are written to tmpfs first (when available) and copied to SCREENSHOT_DIR in the background
+SCREENSHOT_TMP_DIR = os.getenv(
+    "SCREENSHOT_TMP_DIR",
+    "/dev/shm/airflow_screenshots" if os.path.isdir("/dev/shm") else ""
+)
+if SCREENSHOT_TMP_DIR:
+    os.makedirs(SCREENSHOT_TMP_DIR, exist_ok=True)
+
+
+def _load_cached_driver_path():
+    """Return the cached ChromeDriver path, or None if missing or stale."""
+    try:
+        with open(DRIVER_CACHE_FILE, 'r') as f:
+            driver_path = json.load(f).get("driver_path")
+    except (OSError, ValueError):
+        return None
+    
+    if driver_path and os.path.isfile(driver_path):
+        return driver_path
+    return None
+
+
+def _install_driver():
+    """Resolve ChromeDriver via webdriver-manager and atomically update the cache file."""
+    from webdriver_manager.chrome import ChromeDriverManager
+    
+    driver_path = ChromeDriverManager().install()
+    
+    try:
+        cache_dir = os.path.dirname(DRIVER_CACHE_FILE)
+        os.makedirs(cache_dir, exist_ok=True)
+        # Unique temp file per writer, since parallel workers may install concurrently
+        with tempfile.NamedTemporaryFile('w', dir=cache_dir, suffix=".tmp", delete=False) as f:
+            json.dump({"driver_path": driver_path}, f)
+        os.replace(f.name, DRIVER_CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Could not cache ChromeDriver path: {e}")
+    
+    return driver_path
+
+
 class ComposerBrowserAutomation:
-    def __init__(self, headless=False):
+    # Process-wide instance returned by get_shared()
+    _shared = None
+    
+    def __init__(self, headless=False, auth=None, screenshot_format=None):
         """
         Initialize the browser automation for Google Managed Composer.
         
         Args:
             headless (bool): Whether to run the browser in headless mode
+            auth (GoogleCloudAuth): Authenticated Google Cloud handler used for
+                Airflow REST API calls (ADC is used if not provided)
+            screenshot_format (str): 'png', 'jpeg' or 'webp' (defaults to the
+                SCREENSHOT_FORMAT environment variable, then 'png')
         """
+        self.screenshot_format = (screenshot_format or os.getenv("SCREENSHOT_FORMAT", "png")).lower()
+        if self.screenshot_format not in SCREENSHOT_FORMATS:
+            raise ValueError(f"Unsupported screenshot format: {self.screenshot_format}")
+        
         self.headless = headless
         self.driver = None
-        self.screenshots_dir = os.path.join(os.getcwd(), "screenshots")
+        self._waits = {}
+        self.composer_url = None
+        self._auth = auth
+        self.screenshots_dir = SCREENSHOT_DIR
         
-        # Create screenshots directory if it doesn't exist
-        if not os.path.exists(self.screenshots_dir):
-            os.makedirs(self.screenshots_dir)
+        # Background copies from the tmpfs buffer to screenshots_dir (created on first use)
+        self._copier = None
+        self._tmp_files = []
+    
+    def __enter__(self):
+        """Set up the WebDriver (if not already running) for use in a with block."""
+        if not self.driver and not self.setup_driver():
+            raise RuntimeError("Failed to set up Chrome WebDriver")
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the WebDriver when leaving a with block."""
+        self.close()
+        return False
+    
+    @classmethod
+    def get_shared(cls, composer_url, headless=True):
+        """
+        Get a logged-in instance shared across the process.
+        
+        The browser is started and logged in once, then reused for every
+        subsequent DAG inspection (and by later workflows in the same process)
+        until close() is called; whatever is still open is closed at exit.
+        A shared browser started in the other headless mode is replaced, and
+        one logged in to a different environment logs in again.
+        
+        Args:
+            composer_url (str): URL of the Composer environment
+            headless (bool): Whether to run the browser in headless mode
+            
+        Returns:
+            ComposerBrowserAutomation: Shared instance, or None if setup or login failed
+        """
+        shared = cls._shared
+        if shared and shared.driver and shared.headless == headless:
+            if shared.composer_url == composer_url:
+                return shared
+            if shared.login_to_composer(composer_url):
+                return shared
+        
+        if shared:
+            shared.close()
+        
+        automation = cls(headless=headless)
+        if not automation.setup_driver():
+            return None
+        
+        if not automation.login_to_composer(composer_url):
+            automation.close()
+            return None
+        
+        cls._shared = automation
+        return automation
     
     def setup_driver(self):
         """Set up the Chrome WebDriver with appropriate options."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        
         chrome_options = Options()
         if self.headless:
-            chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--disable-gpu")
         
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        chrome_options.add_argument("--window-size=1920,1080")
+        for flag in CHROME_FLAGS:
+            chrome_options.add_argument(flag)
+        
+        # Waits are bound to a specific driver instance
+        self._waits = {}
         
         try:
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=chrome_options)
+            # Reuse the cached driver; only fall back to the manager if it's gone or mismatched
+            driver_path = _load_cached_driver_path()
+            if driver_path:
+                try:
+                    self.driver = webdriver.Chrome(service=Service(driver_path), options=chrome_options)
+                except WebDriverException as e:
+                    logger.warning(f"Cached ChromeDriver failed to start, reinstalling: {e}")
+                    self.driver = None
+            
+            if not self.driver:
+                service = Service(_install_driver())
+                self.driver = webdriver.Chrome(service=service, options=chrome_options)
             logger.info("Chrome WebDriver set up successfully")
             return True
         except Exception as e:
             logger.error(f"Error setting up Chrome WebDriver: {e}")
             return False
     
+    def _wait(self, timeout):
+        """
+        Get a WebDriverWait for the current driver, reused per timeout.
+        
+        Short waits poll more often so quickly-appearing elements are picked up sooner.
+        
+        Args:
+            timeout (int): Maximum time to wait in seconds
+            
+        Returns:
+            WebDriverWait: Wait bound to self.driver
+        """
+        wait = self._waits.get(timeout)
+        if wait is None:
+            from selenium.webdriver.support.ui import WebDriverWait
+            wait = WebDriverWait(self.driver, timeout, poll_frequency=0.2 if timeout <= 10 else 0.5)
+            self._waits[timeout] = wait
+        return wait
+    
     def login_to_composer(self, composer_url, wait_time=60):
         """
         Login to Google Managed Composer using Google authentication.
@@ -79,6 +254,11 @@ class ComposerBrowserAutomation:
             logger.error("WebDriver not initialized. Call setup_driver() first.")
             return False
         
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        self.composer_url = composer_url
+        
         try:
             logger.info(f"Navigating to Composer URL: {composer_url}")
             self.driver.get(composer_url)
@@ -89,7 +269,7 @@ class ComposerBrowserAutomation:
             logger.info(f"Waiting up to {wait_time} seconds for authentication...")
             
             # Wait for Airflow UI to load (looking for the Airflow logo)
-            WebDriverWait(self.driver, wait_time).until(
+            self._wait(wait_time).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".navbar-brand"))
             )
             
@@ -118,6 +298,9 @@ class ComposerBrowserAutomation:
             logger.error("WebDriver not initialized. Call setup_driver() first.")
             return False
         
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
             # Navigate to the DAG details page
             dag_url = f"{self.driver.current_url.split('?')[0]}/tree?dag_id={dag_id}"
@@ -125,18 +308,18 @@ class ComposerBrowserAutomation:
             self.driver.get(dag_url)
             
             # Wait for the page to load
-            WebDriverWait(self.driver, 30).until(
+            self._wait(30).until(
                 EC.presence_of_element_located((By.ID, "dag"))
             )
             
             # Click on the "DAG Runs" tab
-            runs_tab = WebDriverWait(self.driver, 10).until(
+            runs_tab = self._wait(10).until(
                 EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'DAG Runs')]"))
             )
             runs_tab.click()
             
             # Wait for the DAG runs table to load
-            WebDriverWait(self.driver, 30).until(
+            self._wait(30).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".dag-runs-table"))
             )
             
@@ -166,41 +349,54 @@ class ComposerBrowserAutomation:
             logger.error("WebDriver not initialized. Call setup_driver() first.")
             return False
         
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
             # Open the filter dropdown
-            filter_button = WebDriverWait(self.driver, 10).until(
+            filter_button = self._wait(10).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, ".filter-btn"))
             )
             filter_button.click()
             
             # Apply status filter if provided
             if status:
-                status_dropdown = WebDriverWait(self.driver, 10).until(
+                status_dropdown = self._wait(10).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, "select[name='status']"))
                 )
                 status_dropdown.click()
                 
-                status_option = WebDriverWait(self.driver, 10).until(
+                status_option = self._wait(10).until(
                     EC.element_to_be_clickable((By.XPATH, f"//option[contains(text(), '{status}')]"))
                 )
                 status_option.click()
             
             # Apply date range filter if provided
             if date_range:
-                date_input = WebDriverWait(self.driver, 10).until(
+                date_input = self._wait(10).until(
                     EC.element_to_be_clickable((By.CSS_SELECTOR, "input[name='date_range']"))
                 )
                 date_input.clear()
                 date_input.send_keys(date_range)
             
+            # Remember the current first row so we can tell when the table re-renders
+            try:
+                old_row = self.driver.find_element(By.CSS_SELECTOR, ".dag-runs-table tbody tr:first-child")
+            except NoSuchElementException:
+                old_row = None
+            
             # Apply the filters
-            apply_button = WebDriverWait(self.driver, 10).until(
+            apply_button = self._wait(10).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, ".apply-btn"))
             )
             apply_button.click()
             
             # Wait for the filtered results to load
-            time.sleep(5)
+            if old_row is not None:
+                self._wait(10).until(EC.staleness_of(old_row))
+            self._wait(10).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, ".dag-runs-table tbody tr"))
+            )
             
             logger.info(f"Successfully applied filters: status={status}, date_range={date_range}")
             return True
@@ -224,19 +420,25 @@ class ComposerBrowserAutomation:
             logger.error("WebDriver not initialized. Call setup_driver() first.")
             return None
         
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        
         try:
             # Find the first row in the DAG runs table
-            first_row = WebDriverWait(self.driver, 10).until(
+            first_row = self._wait(10).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, ".dag-runs-table tbody tr:first-child"))
             )
             
-            # Extract information from the row
-            run_id = first_row.find_element(By.CSS_SELECTOR, "td:nth-child(1)").text
-            run_type = first_row.find_element(By.CSS_SELECTOR, "td:nth-child(2)").text
-            execution_date = first_row.find_element(By.CSS_SELECTOR, "td:nth-child(3)").text
-            start_date = first_row.find_element(By.CSS_SELECTOR, "td:nth-child(4)").text
-            end_date = first_row.find_element(By.CSS_SELECTOR, "td:nth-child(5)").text
-            status = first_row.find_element(By.CSS_SELECTOR, "td:nth-child(6)").text
+            # Extract all cell texts from the row in a single round trip; textContent
+            # (unlike innerText) doesn't force a layout pass, so whitespace is collapsed here
+            cells = self.driver.execute_script(
+                "return Array.from(arguments[0].children).slice(0, 6).map(c => c.textContent);",
+                first_row
+            )
+            if not cells or len(cells) < 6:
+                raise NoSuchElementException("DAG run row has fewer than 6 cells")
+            
+            run_id, run_type, execution_date, start_date, end_date, status = (" ".join(c.split()) for c in cells)
             
             run_info = {
                 "run_id": run_id,
@@ -262,6 +464,77 @@ class ComposerBrowserAutomation:
             self.take_screenshot("last_run_error")
             return None
     
+    def get_last_dag_run_api(self, dag_id, composer_url=None, status=None):
+        """
+        Get information about the last DAG run from the Airflow REST API.
+        
+        This avoids rendering and scraping the DAG runs page; the browser is
+        only needed for screenshots.
+        
+        Args:
+            dag_id (str): ID of the DAG
+            composer_url (str): Airflow web server URL (defaults to the URL used at login)
+            status (str): Only consider runs in this state (e.g., 'success', 'failed')
+            
+        Returns:
+            dict: Information about the last DAG run, or None if not found
+        """
+        composer_url = composer_url or self.composer_url
+        if not composer_url:
+            logger.error("Composer URL not set. Pass composer_url or call login_to_composer() first.")
+            return None
+        
+        import requests
+        
+        try:
+            if not self._auth:
+                # Import here so the browser-only path doesn't need the Google SDK
+                from google_cloud_auth import GoogleCloudAuth, CLOUD_PLATFORM_SCOPE
+                self._auth = GoogleCloudAuth()
+                self._auth.authenticate_with_adc(scopes=(CLOUD_PLATFORM_SCOPE,))
+            
+            credentials = self._auth.credentials
+            if not credentials:
+                logger.error("No Google Cloud credentials available for the Airflow REST API")
+                return None
+            
+            if not credentials.valid:
+                from google.auth.transport.requests import Request
+                credentials.refresh(Request())
+            
+            params = {"order_by": "-execution_date", "limit": 1}
+            if status:
+                params["state"] = status
+            
+            response = requests.get(
+                f"{composer_url.rstrip('/')}/api/v1/dags/{quote(dag_id, safe='')}/dagRuns",
+                params=params,
+                headers={"Authorization": f"Bearer {credentials.token}"},
+                timeout=10
+            )
+            response.raise_for_status()
+            dag_runs = response.json().get("dag_runs", [])
+            
+            if not dag_runs:
+                logger.error(f"No DAG runs found for {dag_id}")
+                return None
+            
+            dag_run = dag_runs[0]
+            run_info = {
+                "run_id": dag_run.get("dag_run_id"),
+                "run_type": dag_run.get("run_type"),
+                "execution_date": dag_run.get("execution_date") or dag_run.get("logical_date"),
+                "start_date": dag_run.get("start_date"),
+                "end_date": dag_run.get("end_date"),
+                "status": dag_run.get("state")
+            }
+            
+            logger.info(f"Retrieved last DAG run information from API: {run_info}")
+            return run_info
+        except Exception as e:
+            logger.error(f"Error getting last DAG run from API: {e}")
+            return None
+    
     def take_screenshot(self, name_prefix=None):
         """
         Take a screenshot of the current browser window.
@@ -280,80 +553,205 @@ class ComposerBrowserAutomation:
             # Generate a filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             prefix = f"{name_prefix}_" if name_prefix else ""
-            filename = f"{prefix}{timestamp}.png"
-            filepath = os.path.join(self.screenshots_dir, filename)
+            extension, capture_params = SCREENSHOT_FORMATS[self.screenshot_format]
+            filename = f"{prefix}{timestamp}.{extension}"
+            filepath = os.path.join(SCREENSHOT_TMP_DIR or self.screenshots_dir, filename)
             
             # Take the screenshot
-            self.driver.save_screenshot(filepath)
+            if capture_params:
+                # Let Chrome encode the lossy format directly via CDP, skipping Selenium's PNG path
+                result = self.driver.execute_cdp_cmd("Page.captureScreenshot", capture_params)
+                with open(filepath, 'wb') as f:
+                    f.write(base64.b64decode(result["data"]))
+            else:
+                self.driver.save_screenshot(filepath)
+            
+            if SCREENSHOT_TMP_DIR:
+                # The tmpfs file stays valid until close(); persist a copy without blocking
+                if not self._copier:
+                    self._copier = ThreadPoolExecutor(max_workers=2)
+                self._copier.submit(shutil.copy2, filepath, self.persistent_path(filepath))
+                self._tmp_files.append(filepath)
+            
             logger.info(f"Screenshot saved to {filepath}")
             return filepath
         except Exception as e:
             logger.error(f"Error taking screenshot: {e}")
             return None
     
+    def take_screenshot_bytes(self):
+        """
+        Capture the current browser window in memory, without writing a file.
+        
+        Returns:
+            bytes: Image encoded in the configured screenshot format, or None if failed
+        """
+        if not self.driver:
+            logger.error("WebDriver not initialized. Call setup_driver() first.")
+            return None
+        
+        try:
+            _, capture_params = SCREENSHOT_FORMATS[self.screenshot_format]
+            if capture_params:
+                result = self.driver.execute_cdp_cmd("Page.captureScreenshot", capture_params)
+                return base64.b64decode(result["data"])
+            return self.driver.get_screenshot_as_png()
+        except Exception as e:
+            logger.error(f"Error taking screenshot: {e}")
+            return None
+    
+    def persistent_path(self, screenshot_path):
+        """
+        Get the screenshots_dir location a screenshot is copied to.
+        
+        take_screenshot may return a tmpfs path that is removed on close();
+        the copy at this path remains once close() has returned.
+        
+        Args:
+            screenshot_path (str): Path returned by take_screenshot
+            
+        Returns:
+            str: Path of the persisted screenshot
+        """
+        return os.path.join(self.screenshots_dir, os.path.basename(screenshot_path))
+    
+    def capture_dag_run(self, dag_id, status_filter=None, date_range=None):
+        """
+        Capture a screenshot and the last run of a DAG using the logged-in browser.
+        
+        Args:
+            dag_id (str): ID of the DAG to inspect
+            status_filter (str): Filter by run status (e.g., 'success', 'failed')
+            date_range (str): Filter by date range
+            
+        Returns:
+            dict: dag_id, screenshot_path and last_run, or None if navigation failed
+        """
+        if not self.navigate_to_dag_runs(dag_id):
+            logger.error(f"Failed to navigate to DAG runs for {dag_id}")
+            return None
+        
+        # Apply filters if provided
+        if status_filter or date_range:
+            self.filter_dag_runs(status=status_filter, date_range=date_range)
+        
+        # Report the persisted copy, since the returned tmpfs file goes away on close()
+        screenshot_path = self.take_screenshot(f"{dag_id}_filtered_dag_runs")
+        
+        return {
+            "dag_id": dag_id,
+            "screenshot_path": self.persistent_path(screenshot_path) if screenshot_path else None,
+            # Fall back to scraping the page if the REST API is unavailable
+            "last_run": self.get_last_dag_run_api(dag_id, status=status_filter) or self.get_last_dag_run()
+        }
+    
+    def inspect_dag(self, composer_url, dag_id, status_filter=None, date_range=None):
+        """
+        Inspect a single DAG in a dedicated browser session.
+        
+        Sets up the driver, logs in, captures the DAG run and closes the
+        driver, so each call can safely run on its own worker thread.
+        
+        Args:
+            composer_url (str): URL of the Composer environment
+            dag_id (str): ID of the DAG to inspect
+            status_filter (str): Filter by run status (e.g., 'success', 'failed')
+            date_range (str): Filter by date range
+            
+        Returns:
+            dict: dag_id, screenshot_path and last_run, or None if failed
+        """
+        try:
+            if not self.setup_driver():
+                return None
+            
+            if not self.login_to_composer(composer_url):
+                logger.error(f"Failed to login to Composer for {dag_id}")
+                return None
+            
+            return self.capture_dag_run(dag_id, status_filter, date_range)
+        finally:
+            self.close()
+    
     def close(self):
         """Close the WebDriver and release resources."""
         if self.driver:
             self.driver.quit()
             self.driver = None
+            self._waits = {}
             logger.info("WebDriver closed")
+        
+        # Wait for pending copies, then drop the tmpfs buffers
+        if self._copier:
+            self._copier.shutdown(wait=True)
+            self._copier = None
+        for tmp_file in self._tmp_files:
+            try:
+                os.remove(tmp_file)
+            except OSError:
+                pass
+        self._tmp_files = []
+        
+        if ComposerBrowserAutomation._shared is self:
+            ComposerBrowserAutomation._shared = None
+    
+    @classmethod
+    def close_shared(cls):
+        """Close the shared instance, if any; registered to run at interpreter exit."""
+        if cls._shared:
+            cls._shared.close()
+
+
+atexit.register(ComposerBrowserAutomation.close_shared)
 
 
 def main():
     """Main function to demonstrate Composer browser automation."""
     # Get Composer URL from environment variable or use a default
     composer_url = os.getenv("COMPOSER_URL")
-    dag_id = os.getenv("DAG_ID")
+    # DAG_IDS may hold a comma-separated list; DAG_ID is kept for a single DAG
+    dag_ids = [d.strip() for d in (os.getenv("DAG_IDS") or os.getenv("DAG_ID") or "").split(",") if d.strip()]
     
     if not composer_url:
         logger.error("COMPOSER_URL environment variable not set")
         print("Please set the COMPOSER_URL environment variable")
         return
     
-    if not dag_id:
+    if not dag_ids:
         logger.error("DAG_ID environment variable not set")
-        print("Please set the DAG_ID environment variable")
+        print("Please set the DAG_ID (or DAG_IDS) environment variable")
         return
     
-    # Initialize browser automation
-    automation = ComposerBrowserAutomation(headless=False)
+    concurrency = int(os.getenv("BROWSER_CONCURRENCY", "4"))
     
-    try:
-        # Set up the WebDriver
-        if not automation.setup_driver():
-            logger.error("Failed to set up WebDriver")
+    if len(dag_ids) > 1 and concurrency > 1:
+        # Each worker owns its own headless Chrome, so DAGs are inspected in parallel
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(dag_ids))) as executor:
+            results = list(executor.map(
+                lambda d: ComposerBrowserAutomation(headless=True).inspect_dag(composer_url, d, status_filter="success"),
+                dag_ids
+            ))
+    else:
+        # Set up the WebDriver and login to Composer once for all DAGs
+        automation = ComposerBrowserAutomation.get_shared(composer_url, headless=False)
+        if not automation:
+            logger.error("Failed to set up WebDriver or login to Composer")
             return
         
-        # Login to Composer
-        if not automation.login_to_composer(composer_url):
-            logger.error("Failed to login to Composer")
-            return
-        
-        # Navigate to DAG runs
-        if not automation.navigate_to_dag_runs(dag_id):
-            logger.error(f"Failed to navigate to DAG runs for {dag_id}")
-            return
-        
-        # Apply filters (optional)
-        automation.filter_dag_runs(status="success")
-        
-        # Take a screenshot of the filtered DAG runs
-        screenshot_path = automation.take_screenshot("filtered_dag_runs")
-        
-        # Get information about the last DAG run
-        last_run = automation.get_last_dag_run()
+        with automation:
+            results = [automation.capture_dag_run(d, status_filter="success") for d in dag_ids]
+    
+    for result in results:
+        if not result:
+            continue
         
-        if last_run:
-            print("\nLast DAG Run Information:")
-            for key, value in last_run.items():
+        if result["last_run"]:
+            print(f"\nLast DAG Run Information ({result['dag_id']}):")
+            for key, value in result["last_run"].items():
                 print(f"{key}: {value}")
         
-        if screenshot_path:
-            print(f"\nScreenshot saved to: {screenshot_path}")
-    
-    finally:
-        # Clean up
-        automation.close()
+        if result["screenshot_path"]:
+            print(f"\nScreenshot saved to: {result['screenshot_path']}")
 
 
 if __name__ == "__main__":
@@ -7,22 +7,32 @@ using different authentication methods.
 
 import os
 import json
-from google.oauth2 import service_account
+import functools
 from google.auth.transport.requests import Request
 from google.auth import default
-from google.cloud import storage
 from dotenv import load_dotenv
 
 # Load environment variables from .env file (if exists)
 load_dotenv()
 
+
+# OAuth scope covering Google Cloud APIs, including the Composer Airflow REST API
+CLOUD_PLATFORM_SCOPE = "https://www.googleapis.com/auth/cloud-platform"
+
+
+@functools.lru_cache(maxsize=None)
+def _adc(scopes=None):
+    """Resolve Application Default Credentials once per process and scope set."""
+    return default(scopes=list(scopes) if scopes else None)
+
+
 class GoogleCloudAuth:
     def __init__(self):
         """Initialize Google Cloud authentication handler."""
         self.credentials = None
         self.project_id = None
     
-    def authenticate_with_adc(self):
+    def authenticate_with_adc(self, scopes=None):
         """
         Authenticate using Application Default Credentials (ADC).
         
@@ -31,16 +41,20 @@ class GoogleCloudAuth:
         2. User credentials from gcloud auth application-default login
         3. GCE/GKE service account credentials
         
+        Args:
+            scopes (tuple): OAuth scopes to request; service account credentials
+                can't be refreshed without them when calling APIs directly
+            
         Returns:
             tuple: (credentials, project_id)
         """
         try:
-            credentials, project_id = default()
+            credentials, project_id = _adc(tuple(scopes) if scopes else None)
             self.credentials = credentials
             self.project_id = project_id
             
-            # Refresh credentials if needed
-            if hasattr(credentials, 'refresh') and callable(credentials.refresh):
+            # Refresh credentials only if the cached token is missing or expired
+            if not credentials.valid:
                 credentials.refresh(Request())
                 
             return credentials, project_id
@@ -61,20 +75,31 @@ class GoogleCloudAuth:
         # Use provided file path or try to get from environment variable
         service_account_file = service_account_file or os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
         
-        if not service_account_file or not os.path.exists(service_account_file):
+        if not service_account_file:
             print(f"Service account file not found: {service_account_file}")
             return None, None
         
+        # Open the key file directly instead of checking os.path.exists first;
+        # a missing file fails here before the service_account module is imported
         try:
-            credentials = service_account.Credentials.from_service_account_file(
-                service_account_file,
-                scopes=["https://www.googleapis.com/auth/cloud-platform"]
-            )
-            
-            # Get project ID from the service account file
-            with open(service_account_file, 'r') as f:
+            with open(service_account_file, 'rb') as f:
                 service_account_info = json.load(f)
-                project_id = service_account_info.get('project_id')
+        except FileNotFoundError:
+            print(f"Service account file not found: {service_account_file}")
+            return None, None
+        except Exception as e:
+            print(f"Error authenticating with service account: {e}")
+            return None, None
+        
+        # Imported here to keep module import cheap for callers that only use ADC
+        from google.oauth2 import service_account
+        
+        try:
+            credentials = service_account.Credentials.from_service_account_info(
+                service_account_info,
+                scopes=[CLOUD_PLATFORM_SCOPE]
+            )
+            project_id = service_account_info.get('project_id')
             
             self.credentials = credentials
             self.project_id = project_id
@@ -86,7 +111,10 @@ class GoogleCloudAuth:
     
     def test_authentication(self):
         """
-        Test authentication by listing storage buckets.
+        Test authentication by refreshing the credentials' access token.
+        
+        A successful refresh proves the credentials are accepted by Google
+        without making a Cloud Storage API call.
         
         Returns:
             bool: True if authentication is successful, False otherwise
@@ -96,14 +124,11 @@ class GoogleCloudAuth:
             return False
         
         try:
-            # Create a client using the credentials
-            storage_client = storage.Client(
-                credentials=self.credentials,
-                project=self.project_id
-            )
+            self.credentials.refresh(Request())
+            if not self.credentials.token:
+                print("Authentication test failed: no access token returned")
+                return False
             
-            # List buckets to test authentication
-            buckets = list(storage_client.list_buckets(max_results=1))
             print(f"Authentication successful. Project: {self.project_id}")
             return True
         except Exception as e:
@@ -3,27 +3,87 @@ Google Cloud Storage Operations Example
 --------------------------------------
 This script demonstrates how to interact with Google Cloud Storage
 using the Google Cloud Storage client library.
+
+To run many individual operations concurrently, use gcs_parallel_map rather
+than a thread pool: threads sharing one client contend on the GIL and its
+connection pool, while worker processes scale with the number of workers.
 """
 
 import os
-import io
-from google.cloud import storage
-from google.oauth2 import service_account
-from google.auth import default
+import time
+import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 
+# The Google Cloud SDK modules are imported where they are used, so importing this
+# module (or running --help) doesn't pay for loading the storage client stack.
+
 # Load environment variables from .env file (if exists)
 load_dotenv()
 
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Files larger than this are uploaded as concurrent chunks; below it a single request is faster
+DEFAULT_MULTIPART_THRESHOLD = 150 * 1024 * 1024
+
+# Blobs larger than this are downloaded as concurrent byte-range slices
+DEFAULT_SLICED_DOWNLOAD_THRESHOLD = 200 * 1024 * 1024
+
+# Maximum number of calls GCS accepts in one batch request
+BATCH_SIZE_LIMIT = 100
+
+# Maximum number of signed URLs kept per manager
+SIGNED_URL_CACHE_SIZE = 4096
+
 class GCPStorageManager:
-    def __init__(self, credentials=None, project_id=None):
+    def __init__(self, credentials=None, project_id=None,
+                 multipart_threshold=DEFAULT_MULTIPART_THRESHOLD,
+                 multipart_chunk_size=DEFAULT_MULTIPART_THRESHOLD,
+                 multipart_max_workers=10,
+                 sliced_download_threshold=DEFAULT_SLICED_DOWNLOAD_THRESHOLD,
+                 sliced_download_chunk_size=DEFAULT_SLICED_DOWNLOAD_THRESHOLD,
+                 http_pool_size=64):
         """
         Initialize Google Cloud Storage manager.
         
         Args:
             credentials: Google Cloud credentials
             project_id (str): Google Cloud project ID
+            multipart_threshold (int): File size in bytes above which uploads
+                are split into chunks and sent concurrently
+            multipart_chunk_size (int): Chunk size in bytes for concurrent uploads
+            multipart_max_workers (int): Maximum worker processes for concurrent
+                uploads and sliced downloads
+            sliced_download_threshold (int): Blob size in bytes above which downloads
+                are split into concurrent range requests
+            sliced_download_chunk_size (int): Slice size in bytes for sliced downloads
+            http_pool_size (int): Maximum pooled HTTPS connections kept by the client
         """
+        self.multipart_threshold = multipart_threshold
+        self.multipart_chunk_size = multipart_chunk_size
+        self.multipart_max_workers = multipart_max_workers
+        self.sliced_download_threshold = sliced_download_threshold
+        self.sliced_download_chunk_size = sliced_download_chunk_size
+        
+        # (bucket, blob, method, expiration) -> (url, expires_at), least recently used first
+        self._signed_url_cache = OrderedDict()
+        
+        # Download directories already created by this manager
+        self._mkdir_cache = set()
+        
+        # Bucket handles by name, reused across calls
+        self._bucket_cache = {}
+        
+        from google.auth import default
+        from google.cloud import storage
+        from requests.adapters import HTTPAdapter
+        
         if credentials:
             self.credentials = credentials
             self.project_id = project_id
@@ -32,7 +92,7 @@ class GCPStorageManager:
             try:
                 self.credentials, self.project_id = default()
             except Exception as e:
-                print(f"Error getting default credentials: {e}")
+                logger.error(f"Error getting default credentials: {e}")
                 self.credentials = None
                 self.project_id = None
         
@@ -41,9 +101,20 @@ class GCPStorageManager:
                 credentials=self.credentials,
                 project=self.project_id
             )
+            
+            # The default urllib3 pool holds 10 connections, which threads sharing this client contend on
+            adapter = HTTPAdapter(pool_connections=http_pool_size, pool_maxsize=http_pool_size)
+            self.client._http.mount("https://", adapter)
         else:
             raise ValueError("No valid credentials provided")
     
+    def _bucket(self, bucket_name):
+        """Get a cached Bucket handle for bucket_name (no API request is made)."""
+        bucket = self._bucket_cache.get(bucket_name)
+        if bucket is None:
+            bucket = self._bucket_cache[bucket_name] = self.client.bucket(bucket_name)
+        return bucket
+    
     def list_buckets(self, max_results=None):
         """
         List storage buckets in the project.
@@ -55,10 +126,9 @@ class GCPStorageManager:
             list: List of bucket names
         """
         try:
-            buckets = list(self.client.list_buckets(max_results=max_results))
-            return [bucket.name for bucket in buckets]
+            return [bucket.name for bucket in self.client.list_buckets(max_results=max_results)]
         except Exception as e:
-            print(f"Error listing buckets: {e}")
+            logger.error(f"Error listing buckets: {e}")
             return []
     
     def create_bucket(self, bucket_name, location="us-central1"):
@@ -73,12 +143,12 @@ class GCPStorageManager:
             storage.Bucket: Created bucket or None if failed
         """
         try:
-            bucket = self.client.bucket(bucket_name)
+            bucket = self._bucket(bucket_name)
             bucket.create(location=location)
-            print(f"Bucket {bucket_name} created in {location}")
+            logger.info(f"Bucket {bucket_name} created in {location}")
             return bucket
         except Exception as e:
-            print(f"Error creating bucket {bucket_name}: {e}")
+            logger.error(f"Error creating bucket {bucket_name}: {e}")
             return None
     
     def upload_file(self, bucket_name, source_file_path, destination_blob_name=None):
@@ -93,8 +163,12 @@ class GCPStorageManager:
         Returns:
             storage.Blob: Uploaded blob or None if failed
         """
-        if not os.path.exists(source_file_path):
-            print(f"Source file not found: {source_file_path}")
+        from google.cloud.storage import transfer_manager
+        
+        try:
+            file_size = os.path.getsize(source_file_path)
+        except OSError:
+            logger.error(f"Source file not found: {source_file_path}")
             return None
         
         # If destination blob name is not provided, use the source file name
@@ -102,19 +176,52 @@ class GCPStorageManager:
             destination_blob_name = os.path.basename(source_file_path)
         
         try:
-            bucket = self.client.bucket(bucket_name)
+            bucket = self._bucket(bucket_name)
+            blob = bucket.blob(destination_blob_name)
+            
+            # Upload the file; large files go up as parallel parts composed server-side
+            if file_size > self.multipart_threshold:
+                transfer_manager.upload_chunks_concurrently(
+                    source_file_path,
+                    blob,
+                    chunk_size=self.multipart_chunk_size,
+                    max_workers=self.multipart_max_workers
+                )
+            else:
+                blob.upload_from_filename(source_file_path)
+            logger.info(f"File {source_file_path} uploaded to {bucket_name}/{destination_blob_name}")
+            
+            return blob
+        except Exception as e:
+            logger.error(f"Error uploading file: {e}")
+            return None
+    
+    def upload_bytes(self, bucket_name, data, destination_blob_name, content_type="application/octet-stream"):
+        """
+        Upload in-memory data to a bucket without writing a local file.
+        
+        Args:
+            bucket_name (str): Name of the bucket
+            data (bytes): Content to upload
+            destination_blob_name (str): Name of the destination blob
+            content_type (str): MIME type of the content
+            
+        Returns:
+            storage.Blob: Uploaded blob or None if failed
+        """
+        try:
+            bucket = self._bucket(bucket_name)
             blob = bucket.blob(destination_blob_name)
             
-            # Upload the file
-            blob.upload_from_filename(source_file_path)
-            print(f"File {source_file_path} uploaded to {bucket_name}/{destination_blob_name}")
+            blob.upload_from_string(data, content_type=content_type)
+            logger.info(f"Data uploaded to {bucket_name}/{destination_blob_name}")
             
             return blob
         except Exception as e:
-            print(f"Error uploading file: {e}")
+            logger.error(f"Error uploading data: {e}")
             return None
     
-    def download_file(self, bucket_name, source_blob_name, destination_file_path):
+    def download_file(self, bucket_name, source_blob_name, destination_file_path, size=None):
         """
         Download a blob from a bucket.
         
@@ -122,26 +229,128 @@ class GCPStorageManager:
             bucket_name (str): Name of the bucket
             source_blob_name (str): Name of the source blob
             destination_file_path (str): Path to the destination file
+            size (int): Blob size in bytes, if already known (e.g. from a listing);
+                only then are large blobs downloaded as concurrent slices, so no
+                metadata request is spent on the common case
             
         Returns:
             bool: True if successful, False otherwise
         """
+        from google.api_core.exceptions import NotFound
+        from google.cloud.storage import transfer_manager
+        
         try:
-            bucket = self.client.bucket(bucket_name)
+            bucket = self._bucket(bucket_name)
             blob = bucket.blob(source_blob_name)
             
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.dirname(os.path.abspath(destination_file_path)), exist_ok=True)
+            # Create directory if it doesn't exist (once per directory)
+            destination_dir = os.path.dirname(os.path.abspath(destination_file_path))
+            if destination_dir not in self._mkdir_cache:
+                os.makedirs(destination_dir, exist_ok=True)
+                self._mkdir_cache.add(destination_dir)
             
-            # Download the blob
-            blob.download_to_filename(destination_file_path)
-            print(f"Blob {bucket_name}/{source_blob_name} downloaded to {destination_file_path}")
+            # Download the blob; large blobs are fetched as parallel range requests
+            if size and size > self.sliced_download_threshold:
+                transfer_manager.download_chunks_concurrently(
+                    blob,
+                    destination_file_path,
+                    chunk_size=self.sliced_download_chunk_size,
+                    max_workers=self.multipart_max_workers,
+                    worker_type=transfer_manager.PROCESS
+                )
+            else:
+                blob.download_to_filename(destination_file_path)
+            logger.info(f"Blob {bucket_name}/{source_blob_name} downloaded to {destination_file_path}")
             
             return True
+        except NotFound:
+            logger.error(f"Blob not found: {bucket_name}/{source_blob_name}")
+            return False
         except Exception as e:
-            print(f"Error downloading file: {e}")
+            logger.error(f"Error downloading file: {e}")
             return False
     
+    def upload_files(self, bucket_name, filenames, source_directory="", max_workers=8):
+        """
+        Upload many files to a bucket concurrently.
+        
+        Work is spread across worker processes by the transfer manager, so
+        many small files are no longer bound by one request round trip at a time.
+        
+        Args:
+            bucket_name (str): Name of the bucket
+            filenames (list): File paths relative to source_directory; also used as blob names
+            source_directory (str): Directory the file paths are relative to
+            max_workers (int): Maximum number of worker processes
+            
+        Returns:
+            list: Names of the files that were uploaded successfully
+        """
+        from google.cloud.storage import transfer_manager
+        
+        try:
+            bucket = self._bucket(bucket_name)
+            results = transfer_manager.upload_many_from_filenames(
+                bucket,
+                filenames,
+                source_directory=source_directory,
+                max_workers=max_workers,
+                worker_type=transfer_manager.PROCESS
+            )
+        except Exception as e:
+            logger.error(f"Error uploading files: {e}")
+            return []
+        
+        uploaded = []
+        for filename, result in zip(filenames, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error uploading file {filename}: {result}")
+            else:
+                uploaded.append(filename)
+        
+        logger.info(f"Uploaded {len(uploaded)} of {len(filenames)} files to {bucket_name}")
+        return uploaded
+    
+    def download_files(self, bucket_name, blob_names, destination_directory="", max_workers=8):
+        """
+        Download many blobs from a bucket concurrently.
+        
+        Args:
+            bucket_name (str): Name of the bucket
+            blob_names (list): Names of the blobs to download
+            destination_directory (str): Directory to download into; blob names
+                are used as paths relative to it
+            max_workers (int): Maximum number of worker processes
+            
+        Returns:
+            list: Names of the blobs that were downloaded successfully
+        """
+        from google.cloud.storage import transfer_manager
+        
+        try:
+            bucket = self._bucket(bucket_name)
+            results = transfer_manager.download_many_to_path(
+                bucket,
+                blob_names,
+                destination_directory=destination_directory,
+                create_directories=True,
+                max_workers=max_workers,
+                worker_type=transfer_manager.PROCESS
+            )
+        except Exception as e:
+            logger.error(f"Error downloading files: {e}")
+            return []
+        
+        downloaded = []
+        for blob_name, result in zip(blob_names, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error downloading blob {blob_name}: {result}")
+            else:
+                downloaded.append(blob_name)
+        
+        logger.info(f"Downloaded {len(downloaded)} of {len(blob_names)} blobs from {bucket_name}")
+        return downloaded
+    
     def list_blobs(self, bucket_name, prefix=None):
         """
         List blobs in a bucket.
@@ -154,13 +363,29 @@ class GCPStorageManager:
             list: List of blob names
         """
         try:
-            bucket = self.client.bucket(bucket_name)
-            blobs = list(bucket.list_blobs(prefix=prefix))
-            return [blob.name for blob in blobs]
+            return list(self.list_blobs_iter(bucket_name, prefix=prefix))
         except Exception as e:
-            print(f"Error listing blobs: {e}")
+            logger.error(f"Error listing blobs: {e}")
             return []
     
+    def list_blobs_iter(self, bucket_name, prefix=None):
+        """
+        Lazily yield blob names in a bucket, fetching one page at a time.
+        
+        Unlike list_blobs, errors are raised to the caller.
+        
+        Args:
+            bucket_name (str): Name of the bucket
+            prefix (str): Filter results to objects whose names begin with this prefix
+            
+        Yields:
+            str: Blob name
+        """
+        bucket = self._bucket(bucket_name)
+        # Only names are needed, so skip the rest of each object's metadata in the response
+        for blob in bucket.list_blobs(prefix=prefix, fields="items(name),nextPageToken"):
+            yield blob.name
+    
     def delete_blob(self, bucket_name, blob_name):
         """
         Delete a blob from a bucket.
@@ -173,53 +398,126 @@ class GCPStorageManager:
             bool: True if successful, False otherwise
         """
         try:
-            bucket = self.client.bucket(bucket_name)
+            bucket = self._bucket(bucket_name)
             blob = bucket.blob(blob_name)
             blob.delete()
-            print(f"Blob {bucket_name}/{blob_name} deleted")
+            logger.info(f"Blob {bucket_name}/{blob_name} deleted")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting blob: {e}")
+            return False
+    
+    def delete_blobs(self, bucket_name, blob_names):
+        """
+        Delete many blobs from a bucket using batch requests.
+        
+        Deletes are grouped into batches of up to 100, each sent as a single
+        HTTP request instead of one request per blob.
+        
+        Args:
+            bucket_name (str): Name of the bucket
+            blob_names (list): Names of the blobs to delete
+            
+        Returns:
+            bool: True if all blobs were deleted, False otherwise
+        """
+        try:
+            bucket = self._bucket(bucket_name)
+            for start in range(0, len(blob_names), BATCH_SIZE_LIMIT):
+                with self.client.batch():
+                    for blob_name in blob_names[start:start + BATCH_SIZE_LIMIT]:
+                        bucket.blob(blob_name).delete()
+            
+            logger.info(f"Deleted {len(blob_names)} blobs from {bucket_name}")
             return True
         except Exception as e:
-            print(f"Error deleting blob: {e}")
+            logger.error(f"Error deleting blobs: {e}")
             return False
     
-    def generate_signed_url(self, bucket_name, blob_name, expiration=3600):
+    def generate_signed_url(self, bucket_name, blob_name, expiration=3600, method="GET"):
         """
         Generate a signed URL for a blob.
         
+        Signing is CPU-bound, so URLs are cached and reused while at least
+        half of their validity window remains.
+        
         Args:
             bucket_name (str): Name of the bucket
             blob_name (str): Name of the blob
             expiration (int): URL expiration time in seconds
+            method (str): HTTP method the URL is valid for
             
         Returns:
             str: Signed URL or None if failed
         """
+        cache_key = (bucket_name, blob_name, method, expiration)
+        cached = self._signed_url_cache.get(cache_key)
+        if cached and time.time() < cached[1] - expiration / 2:
+            self._signed_url_cache.move_to_end(cache_key)
+            return cached[0]
+        
         try:
-            bucket = self.client.bucket(bucket_name)
+            bucket = self._bucket(bucket_name)
             blob = bucket.blob(blob_name)
             
+            signed_at = time.time()
             url = blob.generate_signed_url(
                 version="v4",
                 expiration=expiration,
-                method="GET"
+                method=method
             )
             
-            print(f"Generated signed URL for {bucket_name}/{blob_name}")
+            self._signed_url_cache[cache_key] = (url, signed_at + expiration)
+            self._signed_url_cache.move_to_end(cache_key)
+            if len(self._signed_url_cache) > SIGNED_URL_CACHE_SIZE:
+                self._signed_url_cache.popitem(last=False)
+            
+            logger.info(f"Generated signed URL for {bucket_name}/{blob_name}")
             return url
         except Exception as e:
-            print(f"Error generating signed URL: {e}")
+            logger.error(f"Error generating signed URL: {e}")
             return None
 
 
-def create_test_file(file_path, content="This is a test file for GCP Storage demo"):
-    """Create a test file with the given content."""
-    try:
-        with open(file_path, 'w') as f:
-            f.write(content)
-        return True
-    except Exception as e:
-        print(f"Error creating test file: {e}")
-        return False
+# (pid, manager) for the current worker process; see get_process_manager
+_process_manager = (None, None)
+
+
+def get_process_manager():
+    """
+    Get a GCPStorageManager for the current process, created on first use.
+    
+    storage.Client is not fork-safe, so a manager inherited from the parent
+    process is never reused; each worker builds its own after the fork.
+    
+    Returns:
+        GCPStorageManager: Manager owned by the current process
+    """
+    global _process_manager
+    pid, manager = _process_manager
+    if pid != os.getpid():
+        manager = GCPStorageManager()
+        _process_manager = (os.getpid(), manager)
+    return manager
+
+
+def gcs_parallel_map(fn, items, workers=64):
+    """
+    Apply fn to every item using a pool of worker processes.
+    
+    fn must be a picklable module-level function; it should call
+    get_process_manager() rather than receive a manager from the caller.
+    
+    Args:
+        fn (callable): Function to apply to each item
+        items (iterable): Items to process
+        workers (int): Number of worker processes
+        
+    Returns:
+        list: Results in the same order as items
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(fn, items))
 
 
 def main():
@@ -246,10 +544,9 @@ def main():
     else:
         print("No buckets found or error listing buckets.")
     
-    # Create a test file
-    test_file_path = "test_upload.txt"
-    if create_test_file(test_file_path):
-        print(f"\nCreated test file: {test_file_path}")
+    # Test content is uploaded straight from memory; no local file is needed
+    test_blob_name = "test_upload.txt"
+    test_content = b"This is a test file for GCP Storage demo"
     
     # Interactive bucket selection or creation
     print("\nChoose an operation:")
@@ -289,7 +586,7 @@ def main():
     
     # Upload the test file
     print(f"\nUploading file to bucket {bucket_name}...")
-    blob = storage_manager.upload_file(bucket_name, test_file_path)
+    blob = storage_manager.upload_bytes(bucket_name, test_content, test_blob_name, content_type="text/plain")
     
     if blob:
         # List blobs in the bucket
@@ -299,27 +596,18 @@ def main():
             print(f"{i}. {blob_name}")
         
         # Generate a signed URL for the uploaded file
-        if test_file_path in blobs or os.path.basename(test_file_path) in blobs:
-            blob_name = test_file_path if test_file_path in blobs else os.path.basename(test_file_path)
-            url = storage_manager.generate_signed_url(bucket_name, blob_name)
+        if test_blob_name in blobs:
+            url = storage_manager.generate_signed_url(bucket_name, test_blob_name)
             if url:
-                print(f"\nSigned URL for {blob_name}: {url}")
+                print(f"\nSigned URL for {test_blob_name}: {url}")
                 print("This URL will expire in 1 hour.")
     
     # Clean up
     print("\nDo you want to delete the test file from the bucket? (y/n)")
     if input().lower() == 'y':
-        blob_name = os.path.basename(test_file_path)
-        if storage_manager.delete_blob(bucket_name, blob_name):
+        if storage_manager.delete_blob(bucket_name, test_blob_name):
             print("Test file deleted from bucket.")
     
-    # Remove local test file
-    try:
-        os.remove(test_file_path)
-        print(f"Local test file {test_file_path} removed.")
-    except Exception as e:
-        print(f"Error removing local test file: {e}")
-    
     print("\nExample completed.")
 
 
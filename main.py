@@ -16,6 +16,7 @@ import logging
 import json
 import time
 from datetime import datetime
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Configure logging
@@ -29,11 +30,26 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Required configuration keys mapped to the environment variables that supply them (read-only)
+REQUIRED_CONFIG = MappingProxyType({
+    'ms_graph_client_id': 'MS_GRAPH_CLIENT_ID',
+    'ms_graph_tenant_id': 'MS_GRAPH_TENANT_ID',
+    'ms_graph_client_secret': 'MS_GRAPH_CLIENT_SECRET',
+    'composer_url': 'COMPOSER_URL',
+    'dag_id': 'DAG_ID',
+    'email_recipients': 'EMAIL_RECIPIENTS',
+})
+
+def split_recipients(recipients):
+    """Split a comma-separated recipient string into a list of trimmed, non-empty addresses."""
+    return [r.strip() for r in recipients.split(',') if r.strip()]
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Composer Screenshot and Email Automation')
     
-    parser.add_argument('--headless', action='store_true', 
+    # Options default to None so only values the user actually passed override the config
+    parser.add_argument('--headless', action=argparse.BooleanOptionalAction, default=None,
                         help='Run browser in headless mode')
     
     parser.add_argument('--dag-id', type=str,
@@ -51,7 +67,7 @@ def parse_arguments():
     parser.add_argument('--email-recipients', type=str,
                         help='Comma-separated list of email recipients (overrides environment variable)')
     
-    parser.add_argument('--send-email', action='store_true',
+    parser.add_argument('--send-email', action=argparse.BooleanOptionalAction, default=None,
                         help='Automatically send the email instead of saving as draft')
     
     parser.add_argument('--config', type=str,
@@ -84,7 +100,7 @@ def load_config(config_path=None):
         'dag_id': os.getenv('DAG_ID'),
         
         # Email settings
-        'email_recipients': os.getenv('EMAIL_RECIPIENTS', '').split(','),
+        'email_recipients': split_recipients(os.getenv('EMAIL_RECIPIENTS', '')),
         
         # Browser settings
         'headless': False,
@@ -115,41 +131,6 @@ def load_config(config_path=None):
     
     return config
 
-def update_config_with_args(config, args):
-    """
-    Update configuration with command line arguments.
-    
-    Args:
-        config (dict): Configuration settings
-        args (Namespace): Command line arguments
-        
-    Returns:
-        dict: Updated configuration settings
-    """
-    # Update configuration with command line arguments
-    if args.headless:
-        config['headless'] = True
-        
-    if args.dag_id:
-        config['dag_id'] = args.dag_id
-        
-    if args.status_filter:
-        config['status_filter'] = args.status_filter
-        
-    if args.date_range:
-        config['date_range'] = args.date_range
-        
-    if args.email_subject:
-        config['email_subject'] = args.email_subject
-        
-    if args.email_recipients:
-        config['email_recipients'] = args.email_recipients.split(',')
-        
-    if args.send_email:
-        config['send_email'] = True
-    
-    return config
-
 def validate_config(config):
     """
     Validate configuration settings.
@@ -160,20 +141,11 @@ def validate_config(config):
     Returns:
         bool: True if valid, False otherwise
     """
-    missing_vars = []
-    
-    if not config['ms_graph_client_id']:
-        missing_vars.append("MS_GRAPH_CLIENT_ID")
-    if not config['ms_graph_tenant_id']:
-        missing_vars.append("MS_GRAPH_TENANT_ID")
-    if not config['ms_graph_client_secret']:
-        missing_vars.append("MS_GRAPH_CLIENT_SECRET")
-    if not config['composer_url']:
-        missing_vars.append("COMPOSER_URL")
-    if not config['dag_id']:
-        missing_vars.append("DAG_ID")
-    if not config['email_recipients'] or not any(config['email_recipients']):
-        missing_vars.append("EMAIL_RECIPIENTS")
+    # any() also rejects a recipient list made only of empty strings
+    missing_vars = [
+        env_name for key, env_name in REQUIRED_CONFIG.items()
+        if not config.get(key) or (key == 'email_recipients' and not any(config[key]))
+    ]
     
     if missing_vars:
         logger.error(f"Missing required configuration: {', '.join(missing_vars)}")
@@ -195,24 +167,19 @@ def run_automation(config):
     from composer_browser_automation import ComposerBrowserAutomation
     from screenshot_email_workflow import ScreenshotEmailWorkflow
     
-    # Set environment variables for components
-    os.environ['MS_GRAPH_CLIENT_ID'] = config['ms_graph_client_id']
-    os.environ['MS_GRAPH_TENANT_ID'] = config['ms_graph_tenant_id']
-    os.environ['MS_GRAPH_CLIENT_SECRET'] = config['ms_graph_client_secret']
-    os.environ['COMPOSER_URL'] = config['composer_url']
-    os.environ['DAG_ID'] = config['dag_id']
-    os.environ['EMAIL_RECIPIENTS'] = ','.join(config['email_recipients'])
-    
-    # Initialize workflow
-    workflow = ScreenshotEmailWorkflow()
+    # Initialize workflow; settings are passed directly rather than through os.environ,
+    # so secrets don't leak into the browser's subprocess environment
+    workflow = ScreenshotEmailWorkflow(config=config)
     
     try:
         # Initialize components
-        if not workflow.initialize_graph_client():
+        graph_ok, browser_ok = workflow.initialize_components(headless=config['headless'])
+        
+        if not graph_ok:
             logger.error("Failed to initialize Microsoft Graph API client")
             return False
         
-        if not workflow.initialize_browser_automation(headless=config['headless']):
+        if not browser_ok:
             logger.error("Failed to initialize browser automation")
             return False
         
@@ -220,22 +187,22 @@ def run_automation(config):
         logger.info(f"Capturing screenshots for DAG: {config['dag_id']}")
         logger.info(f"Filters - Status: {config['status_filter']}, Date Range: {config['date_range']}")
         
-        screenshot_path, run_info = workflow.capture_dag_run_screenshots(
+        screenshot, run_info = workflow.capture_dag_run_screenshots(
             status_filter=config['status_filter'],
             date_range=config['date_range']
         )
         
-        if not screenshot_path or not run_info:
+        if not screenshot or not run_info:
             logger.error("Failed to capture DAG run screenshots or get run information")
             return False
         
-        logger.info(f"Screenshot captured: {screenshot_path}")
+        logger.info(f"Screenshot captured: {len(screenshot)} bytes")
         logger.info(f"Run info: {run_info}")
         
         # Draft an email with the screenshot
         logger.info("Creating draft email with screenshot")
         draft_message = workflow.draft_email_with_screenshot(
-            screenshot_path, 
+            screenshot,
             run_info,
             subject=config['email_subject']
         )
@@ -277,8 +244,12 @@ def main():
     # Load configuration
     config = load_config(args.config)
     
-    # Update configuration with command line arguments
-    config = update_config_with_args(config, args)
+    # Update configuration with command line arguments; every option defaults to
+    # None, so anything else was passed explicitly and overrides the config
+    overrides = {k: v for k, v in vars(args).items() if v is not None and k != 'config'}
+    if 'email_recipients' in overrides:
+        overrides['email_recipients'] = split_recipients(overrides['email_recipients'])
+    config.update(overrides)
     
     # Validate configuration
     if not validate_config(config):
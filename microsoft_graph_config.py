@@ -55,8 +55,12 @@ def create_env_file(env_file='.env'):
     if os.path.exists(env_file):
         with open(env_file, 'r') as f:
             for line in f:
-                if '=' in line:
-                    key, value = line.strip().split('=', 1)
+                line = line.strip()
+                # Skip blank lines and comments
+                if not line or line.startswith('#'):
+                    continue
+                key, sep, value = line.partition('=')
+                if sep:
                     env_vars[key] = value
     
     # Get credentials from user input if not in environment
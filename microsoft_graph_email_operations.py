@@ -6,64 +6,1242 @@ It includes examples for drafting, sending, and managing emails via Outlook.
 """
 
 import os
+import io
+import gzip
 import json
+import mmap
+import time
+import random
+import asyncio
+import logging
+import tempfile
+import threading
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from functools import cache, lru_cache
+from typing import NamedTuple
 from datetime import datetime
 from configparser import ConfigParser
+import httpx
+import orjson
+import pybase64
+from azure.core.credentials import AccessToken
 from azure.identity import ClientSecretCredential
-from msgraph.core import GraphClient
+from azure.identity.aio import ClientSecretCredential as AsyncClientSecretCredential
 from dotenv import load_dotenv
 
 # Load environment variables from .env file (if exists)
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Maximum number of requests Graph accepts in one JSON batch
+BATCH_SIZE_LIMIT = 20
+
+# Maximum concurrent requests Graph allows against a single mailbox
+MAILBOX_CONCURRENCY_LIMIT = 4
+
+# Graph allows 150 MB of uploads per mailbox every 5 minutes; stay a little under it
+MAILBOX_UPLOAD_LIMIT = 140 * 1024 * 1024
+MAILBOX_UPLOAD_WINDOW = 300
+
+# Graph API base URL and the scope requested for app-only tokens
+GRAPH_BASE_URL = "https://graph.microsoft.com/v1.0"
+GRAPH_SCOPE = "https://graph.microsoft.com/.default"
+
+# Number of pooled keep-alive connections to the Graph API
+HTTP_POOL_SIZE = 20
+
+# Message fields fetched by default when listing; the body is only returned on request
+DEFAULT_MESSAGE_FIELDS = ("subject", "from", "receivedDateTime")
+
+# Attachments larger than this go through an upload session instead of inline base64;
+# createUploadSession rejects message attachments under 3 MB
+INLINE_ATTACHMENT_LIMIT = 3 * 1024 * 1024
+
+# Bytes sent per upload session request; Outlook rejects PUTs of 4 MB or more
+UPLOAD_CHUNK_SIZE = 10 * 320 * 1024
+
+# JSON request bodies at least this large are gzip-compressed when gzip_requests is set
+GZIP_MIN_SIZE = 8 * 1024
+
+# Graph access tokens are kept here between runs, readable by the owner only
+TOKEN_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "airflow-ai", "graph_token.json")
+
+# Cached tokens are refreshed this many seconds before they expire
+TOKEN_REFRESH_MARGIN = 60
+
+# Throttled or failed requests are retried up to this many attempts in total
+MAX_ATTEMPTS = 5
+
+# Responses where Graph did not act on the request, so any method can be retried,
+# honouring Retry-After when present
+RETRY_STATUS_CODES = (429, 503)
+
+# Server errors that may arrive after Graph has already acted (e.g. sent a mail),
+# so they are only retried for idempotent requests
+IDEMPOTENT_RETRY_STATUS_CODES = (500, 502, 504)
+
+# Methods that are safe to repeat; PUT covers re-sending the same upload session range
+IDEMPOTENT_METHODS = ("GET", "PUT")
+
+
+def _should_retry(method, status_code):
+    """
+    Return whether a response may be retried without repeating a side effect.
+    
+    Args:
+        method (str): HTTP method of the request
+        status_code (int): Response status code
+        
+    Returns:
+        bool: True if the request can safely be sent again
+    """
+    if status_code in RETRY_STATUS_CODES:
+        return True
+    return method.upper() in IDEMPOTENT_METHODS and status_code in IDEMPOTENT_RETRY_STATUS_CODES
+
+
+def _retry_delay(attempt, retry_after=None):
+    """
+    Return how long to wait before retrying a throttled or failed request.
+    
+    Args:
+        attempt (int): Number of attempts made so far, starting at 1
+        retry_after (str): Retry-After header value, if the server sent one
+        
+    Returns:
+        float: Delay in seconds
+    """
+    if retry_after is not None:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    # Jittered exponential backoff: up to 1s, 2s, 4s, ...
+    return random.uniform(0, 2 ** (attempt - 1))
+
+
+def _json_body(payload, compress=False):
+    """
+    Serialize a JSON request body, gzip-compressing it if large and compress is set.
+    
+    Args:
+        payload (dict): JSON body
+        compress (bool): Whether large bodies may be gzip-compressed; Graph doesn't
+            document compressed request bodies, so callers opt in
+        
+    Returns:
+        tuple: (body bytes, request headers)
+    """
+    # orjson writes large base64 contentBytes strings without a Python-level escape pass
+    body = orjson.dumps(payload)
+    headers = {"Content-Type": "application/json"}
+    
+    if compress and len(body) >= GZIP_MIN_SIZE:
+        body = gzip.compress(body)
+        headers["Content-Encoding"] = "gzip"
+    
+    return body, headers
+
+
+def _load_token_cache():
+    """Return the on-disk token cache, or an empty dict if missing or unreadable."""
+    try:
+        with open(TOKEN_CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_token_cache(cache):
+    """Atomically write the token cache file with owner-only permissions."""
+    try:
+        cache_dir = os.path.dirname(TOKEN_CACHE_FILE)
+        os.makedirs(cache_dir, exist_ok=True)
+        # NamedTemporaryFile creates the file with mode 0600
+        with tempfile.NamedTemporaryFile('w', dir=cache_dir, suffix=".tmp", delete=False) as f:
+            json.dump(cache, f)
+        os.replace(f.name, TOKEN_CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Could not cache Graph access token: {e}")
+
+
+class _MailboxBucket:
+    """
+    Keeps Graph calls against one mailbox within its throttling limits.
+    
+    A semaphore caps concurrent requests, and a sliding window of recent upload
+    sizes delays a request that would push the mailbox past its upload volume,
+    so calls wait locally instead of being answered with 429s. One bucket is
+    shared by every manager, thread and event loop using the mailbox; see
+    _mailbox_bucket().
+    """
+    
+    def __init__(self, concurrency=MAILBOX_CONCURRENCY_LIMIT, upload_limit=MAILBOX_UPLOAD_LIMIT,
+                 window=MAILBOX_UPLOAD_WINDOW):
+        """
+        Args:
+            concurrency (int): Maximum concurrent requests
+            upload_limit (int): Maximum bytes uploaded per window
+            window (float): Window length in seconds
+        """
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._lock = threading.Lock()
+        self.upload_limit = upload_limit
+        self.window = window
+        # (monotonic timestamp, bytes) for uploads still inside the window
+        self._uploads = deque()
+        self._uploaded_bytes = 0
+    
+    def _try_record(self, nbytes):
+        """
+        Record an upload of nbytes if it fits in the window.
+        
+        Args:
+            nbytes (int): Size of the request body about to be sent
+            
+        Returns:
+            float: None if recorded, otherwise seconds until the oldest upload ages out
+        """
+        with self._lock:
+            now = time.monotonic()
+            while self._uploads and now - self._uploads[0][0] >= self.window:
+                self._uploaded_bytes -= self._uploads.popleft()[1]
+            if self._uploads and self._uploaded_bytes + nbytes > self.upload_limit:
+                return self.window - (now - self._uploads[0][0])
+            
+            self._uploads.append((now, nbytes))
+            self._uploaded_bytes += nbytes
+            return None
+    
+    @contextmanager
+    def reserve(self, nbytes):
+        """
+        Hold a request slot, first waiting until nbytes fit in the upload window.
+        
+        Must not be nested: a caller holding a slot would wait on itself.
+        
+        Args:
+            nbytes (int): Size of the request body about to be sent
+        """
+        with self._slots:
+            while (delay := self._try_record(nbytes)) is not None:
+                time.sleep(delay)
+            yield
+    
+    @asynccontextmanager
+    async def reserve_async(self, nbytes):
+        """
+        Async version of reserve() that waits without blocking the event loop.
+        
+        Args:
+            nbytes (int): Size of the request body about to be sent
+        """
+        # Block on the shared semaphore in a worker thread; if this task is cancelled
+        # while waiting, hand the slot back as soon as the thread gets it
+        acquired = asyncio.get_running_loop().run_in_executor(None, self._slots.acquire)
+        try:
+            await asyncio.shield(acquired)
+        except asyncio.CancelledError:
+            acquired.add_done_callback(lambda _: self._slots.release())
+            raise
+        
+        try:
+            while (delay := self._try_record(nbytes)) is not None:
+                await asyncio.sleep(delay)
+            yield
+        finally:
+            self._slots.release()
+
+
+# One throttling bucket per mailbox, shared across the process
+_MAILBOX_BUCKETS = {}
+_MAILBOX_BUCKETS_LOCK = threading.Lock()
+
+
+def _mailbox_bucket(tenant_id, client_id):
+    """
+    Return the process-wide throttling bucket for an app's mailbox, creating it on first use.
+    
+    /me resolves to the app's mailbox, so the bucket is keyed by tenant and client.
+    
+    Args:
+        tenant_id (str): Azure AD tenant ID
+        client_id (str): Azure AD application client ID
+        
+    Returns:
+        _MailboxBucket: The shared bucket
+    """
+    key = (tenant_id, client_id)
+    with _MAILBOX_BUCKETS_LOCK:
+        if key not in _MAILBOX_BUCKETS:
+            _MAILBOX_BUCKETS[key] = _MailboxBucket()
+        return _MAILBOX_BUCKETS[key]
+
+
+class GraphCredentials(NamedTuple):
+    """Azure AD application credentials for the Graph API."""
+    client_id: str
+    tenant_id: str
+    client_secret: str
+
+
+@cache
+def _default_credentials():
+    """
+    Read the default credentials once per process: config.ini first, then the
+    MS_GRAPH_* environment variables for anything it doesn't set.
+    """
+    config = load_config() or {}
+    return GraphCredentials(
+        client_id=config.get('client_id') or os.getenv("MS_GRAPH_CLIENT_ID"),
+        tenant_id=config.get('tenant_id') or os.getenv("MS_GRAPH_TENANT_ID"),
+        client_secret=config.get('client_secret') or os.getenv("MS_GRAPH_CLIENT_SECRET")
+    )
+
+
+def resolve_credentials(client_id=None, tenant_id=None, client_secret=None):
+    """
+    Fill in missing credentials from config.ini or the environment.
+    
+    Args:
+        client_id (str): Azure AD application client ID
+        tenant_id (str): Azure AD tenant ID
+        client_secret (str): Azure AD application client secret
+        
+    Returns:
+        GraphCredentials: The resolved credentials
+        
+    Raises:
+        ValueError: If any credential is still missing
+    """
+    defaults = _default_credentials()
+    credentials = GraphCredentials(
+        client_id=client_id or defaults.client_id,
+        tenant_id=tenant_id or defaults.tenant_id,
+        client_secret=client_secret or defaults.client_secret
+    )
+    
+    if not all(credentials):
+        raise ValueError("Missing required authentication credentials")
+    
+    return credentials
+
+
+def format_recipients(recipients):
+    """
+    Return the Graph toRecipients list for a list of email addresses.
+    
+    Results are cached, so repeated sends to the same recipients reuse one
+    structure instead of rebuilding it each time. Treat the result as read-only.
+    
+    Args:
+        recipients (list): List of recipient email addresses
+        
+    Returns:
+        tuple: Recipient dicts in the same order as the addresses
+    """
+    return _format_recipients(tuple(recipients))
+
+
+@lru_cache(maxsize=1024)
+def _format_recipients(recipients):
+    return tuple({"emailAddress": {"address": email}} for email in recipients)
+
+
+class CachedTokenCredential:
+    """
+    Wraps a credential so its access token is reused until shortly before expiry.
+    
+    Tokens are kept in a class-level cache keyed by tenant, client and scopes, so
+    every manager built for the same app shares one token instead of each going
+    back to Azure AD. They are also written to TOKEN_CACHE_FILE, so a scheduled
+    run can skip the token exchange entirely while an earlier token is valid.
+    """
+    
+    _tokens = {}
+    
+    def __init__(self, credential, tenant_id, client_id):
+        """
+        Args:
+            credential: Credential used to fetch tokens on a cache miss
+            tenant_id (str): Azure AD tenant ID
+            client_id (str): Azure AD application client ID
+        """
+        self.credential = credential
+        self._key = (tenant_id, client_id)
+    
+    def _cached_token(self, scopes):
+        """Return a cached token for scopes that isn't about to expire, or None."""
+        key = self._key + scopes
+        token = self._tokens.get(key)
+        if token is None:
+            entry = _load_token_cache().get(":".join(key))
+            if entry:
+                token = self._tokens[key] = AccessToken(entry["token"], entry["expires_on"])
+        
+        if token is None or token.expires_on - TOKEN_REFRESH_MARGIN < time.time():
+            return None
+        return token
+    
+    def _store_token(self, scopes, token):
+        """Keep a freshly fetched token in memory and on disk."""
+        key = self._key + scopes
+        self._tokens[key] = token
+        cache = _load_token_cache()
+        cache[":".join(key)] = {"token": token.token, "expires_on": token.expires_on}
+        _save_token_cache(cache)
+    
+    def get_token(self, *scopes, **kwargs):
+        """
+        Return a cached access token, fetching a new one if it is missing or about to expire.
+        
+        Args:
+            *scopes: Scopes the token is requested for
+            **kwargs: Passed through to the wrapped credential
+            
+        Returns:
+            azure.core.credentials.AccessToken: The access token
+        """
+        token = self._cached_token(scopes)
+        if token is None:
+            token = self.credential.get_token(*scopes, **kwargs)
+            self._store_token(scopes, token)
+        return token
+    
+    def close(self):
+        """Close the wrapped credential."""
+        self.credential.close()
+
+
+class AsyncCachedTokenCredential(CachedTokenCredential):
+    """CachedTokenCredential for an azure.identity.aio credential; shares the same cache."""
+    
+    async def get_token(self, *scopes, **kwargs):
+        """
+        Return a cached access token, fetching a new one if it is missing or about to expire.
+        
+        Args:
+            *scopes: Scopes the token is requested for
+            **kwargs: Passed through to the wrapped credential
+            
+        Returns:
+            azure.core.credentials.AccessToken: The access token
+        """
+        token = self._cached_token(scopes)
+        if token is None:
+            token = await self.credential.get_token(*scopes, **kwargs)
+            self._store_token(scopes, token)
+        return token
+    
+    async def close(self):
+        """Close the wrapped credential."""
+        await self.credential.close()
+
+
 class OutlookEmailManager:
-    def __init__(self, client_id=None, tenant_id=None, client_secret=None):
+    # Process-wide instance returned by get_email_manager()
+    _shared = None
+    
+    def __init__(self, client_id=None, tenant_id=None, client_secret=None, gzip_requests=False):
+        """
+        Initialize Outlook Email Manager with Microsoft Graph API credentials.
+        
+        Args:
+            client_id (str): Azure AD application client ID
+            tenant_id (str): Azure AD tenant ID
+            client_secret (str): Azure AD application client secret
+            gzip_requests (bool): Whether to gzip-compress large JSON request bodies
+        """
+        # Use provided credentials or fall back to config.ini and environment variables
+        self.client_id, self.tenant_id, self.client_secret = resolve_credentials(
+            client_id, tenant_id, client_secret
+        )
+        
+        # Initialize the credential object, reusing tokens across instances
+        self.credential = CachedTokenCredential(
+            ClientSecretCredential(
+                tenant_id=self.tenant_id,
+                client_id=self.client_id,
+                client_secret=self.client_secret
+            ),
+            self.tenant_id,
+            self.client_id
+        )
+        
+        # One pooled HTTP/2 client for every call, so requests are multiplexed over a
+        # reused TLS connection; it sends no default auth, as upload URLs must not get one
+        self._client = httpx.Client(
+            base_url=GRAPH_BASE_URL,
+            http2=True,
+            limits=httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE)
+        )
+        
+        # Shared with every other manager using this app's mailbox
+        self._mailbox = _mailbox_bucket(self.tenant_id, self.client_id)
+        self.gzip_requests = gzip_requests
+    
+    def _request(self, method, endpoint, **kwargs):
+        """
+        Send a request to the Graph API on the pooled client.
+        
+        Args:
+            method (str): HTTP method
+            endpoint (str): Path relative to the API version, e.g. "/me/messages",
+                or an absolute URL such as an @odata.nextLink
+            **kwargs: Passed through to httpx.Client.request; a json payload is
+                serialized with orjson
+            
+        Returns:
+            httpx.Response: The HTTP response
+        """
+        headers = dict(kwargs.pop("headers", {}))
+        
+        if "json" in kwargs:
+            kwargs["content"], json_headers = _json_body(kwargs.pop("json"), self.gzip_requests)
+            headers.update(json_headers)
+        
+        # Retry throttled requests (and failed idempotent ones), waiting as long as Graph asks
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            token = self.credential.get_token(GRAPH_SCOPE)
+            headers["Authorization"] = f"Bearer {token.token}"
+            with self._mailbox.reserve(len(kwargs.get("content") or b"")):
+                response = self._client.request(method, endpoint, headers=headers, **kwargs)
+            if not _should_retry(method, response.status_code) or attempt == MAX_ATTEMPTS:
+                return response
+            time.sleep(_retry_delay(attempt, response.headers.get("Retry-After")))
+    
+    def get_me(self):
+        """Get information about the authenticated user."""
+        response = self._request("GET", "/me")
+        return orjson.loads(response.content)
+    
+    def list_messages(self, top=10, select=DEFAULT_MESSAGE_FIELDS):
+        """
+        List recent emails in the user's mailbox.
+        
+        Args:
+            top (int): Number of messages to retrieve
+            select (tuple): Message fields to return; include "body" to get
+                message bodies, or pass None for every field
+            
+        Returns:
+            dict: JSON response containing messages
+        """
+        endpoint = f"/me/messages?$top={top}"
+        
+        if select:
+            endpoint += f"&$select={','.join(select)}"
+        
+        response = self._request("GET", endpoint)
+        return orjson.loads(response.content)
+    
+    def get_inbox_messages(self, top=10, filter_string=None, select=DEFAULT_MESSAGE_FIELDS):
+        """
+        Get messages from the user's inbox with optional filtering.
+        
+        Args:
+            top (int): Number of messages to retrieve
+            filter_string (str): OData filter string
+            select (tuple): Message fields to return; include "body" to get
+                message bodies, or pass None for every field
+            
+        Returns:
+            dict: JSON response containing messages
+        """
+        endpoint = self._inbox_endpoint(top, filter_string, select)
+        
+        response = self._request("GET", endpoint)
+        return orjson.loads(response.content)
+    
+    def iter_inbox_messages(self, page_size=50, filter_string=None, select=DEFAULT_MESSAGE_FIELDS):
+        """
+        Iterate over every inbox message, fetching one page at a time.
+        
+        Pages are followed through @odata.nextLink, so callers can start on the
+        first messages without waiting for one large response.
+        
+        Args:
+            page_size (int): Number of messages per request
+            filter_string (str): OData filter string
+            select (tuple): Message fields to return; include "body" to get
+                message bodies, or pass None for every field
+            
+        Yields:
+            dict: One message at a time
+        """
+        endpoint = self._inbox_endpoint(page_size, filter_string, select)
+        
+        while endpoint:
+            page = orjson.loads(self._request("GET", endpoint).content)
+            yield from page.get("value", [])
+            endpoint = page.get("@odata.nextLink")
+    
+    @staticmethod
+    def _inbox_endpoint(top, filter_string=None, select=DEFAULT_MESSAGE_FIELDS):
+        """
+        Build the inbox messages endpoint with its query options.
+        
+        Args:
+            top (int): Number of messages to retrieve
+            filter_string (str): OData filter string
+            select (tuple): Message fields to return
+            
+        Returns:
+            str: Endpoint path
+        """
+        endpoint = f"/me/mailFolders/inbox/messages?$top={top}"
+        
+        if filter_string:
+            endpoint += f"&$filter={filter_string}"
+        
+        if select:
+            endpoint += f"&$select={','.join(select)}"
+        
+        return endpoint
+    
+    def batch(self, sub_requests, batch_size=BATCH_SIZE_LIMIT):
+        """
+        Send several Graph requests as JSON batches instead of one round trip each.
+        
+        Args:
+            sub_requests (list): Request dicts with "method", "url" (relative to the
+                API version, e.g. "/me/messages") and an optional JSON "body"
+            batch_size (int): Maximum number of requests per batch call; use
+                MAILBOX_CONCURRENCY_LIMIT for requests against one mailbox
+            
+        Returns:
+            list: Sub-responses (dicts with "status", "headers" and "body"),
+                in the same order as the requests
+        """
+        responses = []
+        for start in range(0, len(sub_requests), batch_size):
+            chunk = sub_requests[start:start + batch_size]
+            results = self._send_batch(chunk)
+            
+            # Re-submit only the sub-requests that were throttled
+            for attempt in range(1, MAX_ATTEMPTS):
+                throttled = [idx for idx, result in enumerate(results) if result.get("status") == 429]
+                if not throttled:
+                    break
+                
+                delay = max(
+                    _retry_delay(attempt, results[idx].get("headers", {}).get("Retry-After"))
+                    for idx in throttled
+                )
+                time.sleep(delay)
+                
+                for idx, result in zip(throttled, self._send_batch([chunk[idx] for idx in throttled])):
+                    results[idx] = result
+            
+            responses.extend(results)
+        
+        return responses
+    
+    def _send_batch(self, sub_requests):
+        """
+        Send up to BATCH_SIZE_LIMIT sub-requests in one batch call.
+        
+        Args:
+            sub_requests (list): Request dicts as accepted by batch()
+            
+        Returns:
+            list: Sub-responses in the same order as the requests
+        """
+        payload = {"requests": []}
+        for idx, sub_request in enumerate(sub_requests, 1):
+            item = {"id": str(idx), "method": sub_request["method"], "url": sub_request["url"]}
+            if "body" in sub_request:
+                item["body"] = sub_request["body"]
+                item["headers"] = {"Content-Type": "application/json"}
+            payload["requests"].append(item)
+        
+        response = self._request("POST", "/$batch", json=payload)
+        # Graph may return sub-responses in any order
+        by_id = {item["id"]: item for item in orjson.loads(response.content).get("responses", [])}
+        return [by_id.get(str(idx), {}) for idx in range(1, len(sub_requests) + 1)]
+    
+    def create_draft_email(self, subject, body, recipients, is_html=False, attachments=None):
+        """
+        Create a draft email in the user's drafts folder.
+        
+        Args:
+            subject (str): Email subject
+            body (str): Email body content
+            recipients (list): List of recipient email addresses
+            is_html (bool): Whether the body content is HTML
+            attachments (list): List of file paths to attach
+            
+        Returns:
+            dict: JSON response containing the created message
+        """
+        message = self.message_payload(subject, body, recipients, is_html)
+        
+        # Create the draft message
+        created_message = self.create_draft(message)
+        
+        # Add attachments if provided, batched rather than one request per file.
+        # Graph batches can't feed the new draft's ID into later requests, so the
+        # draft itself has to be created first.
+        if attachments and created_message.get('id'):
+            # Large files need their own upload session and can't be batched
+            inline_attachments = []
+            for path in attachments:
+                file_size = self._attachment_size(path)
+                if file_size > INLINE_ATTACHMENT_LIMIT:
+                    self._upload_attachment(created_message['id'], path, file_size)
+                else:
+                    inline_attachments.append(path)
+            
+            attachment_endpoint = f"/me/messages/{created_message['id']}/attachments"
+            attachment_requests = [
+                {"method": "POST", "url": attachment_endpoint, "body": self._attachment_payload(path)}
+                for path in inline_attachments
+            ]
+            for path, result in zip(inline_attachments, self.batch(attachment_requests, batch_size=MAILBOX_CONCURRENCY_LIMIT)):
+                if result.get("status") not in (200, 201):
+                    raise RuntimeError(f"Failed to attach {path}: {result.get('body')}")
+        
+        return created_message
+    
+    def create_draft(self, message):
+        """
+        Create a draft from a prebuilt message resource.
+        
+        Args:
+            message (dict): Message payload, e.g. from message_payload(); may
+                include small attachments inline
+            
+        Returns:
+            dict: JSON response containing the created message
+            
+        Raises:
+            httpx.HTTPStatusError: If Graph rejects the request
+        """
+        response = self._request("POST", "/me/messages", json=message)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    @staticmethod
+    def message_payload(subject, body, recipients, is_html=False):
+        """
+        Build the message resource for a draft.
+        
+        Args:
+            subject (str): Email subject
+            body (str): Email body content
+            recipients (list): List of recipient email addresses
+            is_html (bool): Whether the body content is HTML
+            
+        Returns:
+            dict: Message payload for the Graph messages endpoint
+        """
+        return {
+            "subject": subject,
+            "body": {
+                "contentType": "HTML" if is_html else "Text",
+                "content": body
+            },
+            "toRecipients": format_recipients(recipients)
+        }
+    
+    def add_attachment(self, message_id, file_path):
+        """
+        Add an attachment to an existing message.
+        
+        Args:
+            message_id (str): ID of the message
+            file_path (str): Path to the file to attach
+            
+        Returns:
+            dict: JSON response containing the attachment info
+        """
+        file_size = self._attachment_size(file_path)
+        
+        # Large files are streamed in raw chunks rather than base64-encoded in memory
+        if file_size > INLINE_ATTACHMENT_LIMIT:
+            return self._upload_attachment(message_id, file_path, file_size)
+        
+        attachment = self._attachment_payload(file_path)
+        
+        # Add attachment to message
+        endpoint = f"/me/messages/{message_id}/attachments"
+        response = self._request("POST", endpoint, json=attachment)
+        return orjson.loads(response.content)
+    
+    def add_attachment_bytes(self, message_id, file_name, content):
+        """
+        Add in-memory content as an attachment to an existing message.
+        
+        Args:
+            message_id (str): ID of the message
+            file_name (str): Name of the attachment
+            content (bytes): Content of the file to attach
+            
+        Returns:
+            dict: JSON response containing the attachment info
+            
+        Raises:
+            httpx.HTTPStatusError: If Graph rejects the request
+        """
+        # Large content is sent in raw chunks rather than base64-encoded
+        if len(content) > INLINE_ATTACHMENT_LIMIT:
+            return self._upload_stream(message_id, file_name, len(content), io.BytesIO(content))
+        
+        endpoint = f"/me/messages/{message_id}/attachments"
+        response = self._request("POST", endpoint, json=self.bytes_attachment_payload(file_name, content))
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    def _upload_attachment(self, message_id, file_path, file_size):
+        """
+        Attach a large file through an upload session, one chunk at a time.
+        
+        Args:
+            message_id (str): ID of the message
+            file_path (str): Path to the file to attach
+            file_size (int): Size of the file in bytes
+            
+        Returns:
+            dict: Name and size of the uploaded attachment
+        """
+        with open(file_path, 'rb') as file:
+            return self._upload_stream(message_id, os.path.basename(file_path), file_size, file)
+    
+    def _upload_stream(self, message_id, file_name, file_size, file):
+        """
+        Attach the content of a binary file object through an upload session.
+        
+        Args:
+            message_id (str): ID of the message
+            file_name (str): Name of the attachment
+            file_size (int): Size of the content in bytes
+            file: Binary file object positioned at the start of the content
+            
+        Returns:
+            dict: Name and size of the uploaded attachment
+        """
+        endpoint = f"/me/messages/{message_id}/attachments/createUploadSession"
+        response = self._request("POST", endpoint, json=self._upload_session_payload(file_name, file_size))
+        response.raise_for_status()
+        upload_url = orjson.loads(response.content)["uploadUrl"]
+        
+        # The upload URL is pre-authorized and must not be sent a bearer token
+        offset = 0
+        while True:
+            chunk = file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            self._put_chunk(upload_url, chunk, offset, file_size)
+            offset += len(chunk)
+        
+        return {"name": file_name, "size": file_size}
+    
+    def _put_chunk(self, upload_url, chunk, offset, file_size):
+        """
+        PUT one upload session chunk, retrying it like any other Graph request.
+        
+        Args:
+            upload_url (str): Pre-authorized upload session URL
+            chunk (bytes): Chunk content
+            offset (int): Position of the chunk in the file
+            file_size (int): Size of the whole file in bytes
+            
+        Returns:
+            httpx.Response: The HTTP response
+        """
+        headers = {"Content-Range": f"bytes {offset}-{offset + len(chunk) - 1}/{file_size}"}
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            with self._mailbox.reserve(len(chunk)):
+                response = self._client.put(upload_url, content=chunk, headers=headers)
+            if not _should_retry("PUT", response.status_code) or attempt == MAX_ATTEMPTS:
+                break
+            time.sleep(_retry_delay(attempt, response.headers.get("Retry-After")))
+        response.raise_for_status()
+        return response
+    
+    @staticmethod
+    def _attachment_size(file_path):
+        """
+        Return the size of a file to attach.
+        
+        Args:
+            file_path (str): Path to the file to attach
+            
+        Returns:
+            int: File size in bytes
+        """
+        try:
+            return os.path.getsize(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
+    
+    @staticmethod
+    def _upload_session_payload(file_name, file_size):
+        """
+        Build the createUploadSession payload for a file attachment.
+        
+        Args:
+            file_name (str): Name of the attachment
+            file_size (int): Size of the file in bytes
+            
+        Returns:
+            dict: Upload session request payload
+        """
+        return {
+            "AttachmentItem": {
+                "attachmentType": "file",
+                "name": file_name,
+                "size": file_size
+            }
+        }
+    
+    @staticmethod
+    def bytes_attachment_payload(file_name, content):
+        """
+        Build the fileAttachment payload for in-memory content.
+        
+        Args:
+            file_name (str): Name of the attachment
+            content (bytes): Content of the file to attach
+            
+        Returns:
+            dict: Attachment payload for the Graph attachments endpoint, or for a
+                message's "attachments" list
         """
-        Initialize Outlook Email Manager with Microsoft Graph API credentials.
+        return {
+            "@odata.type": "#microsoft.graph.fileAttachment",
+            "name": file_name,
+            "contentBytes": pybase64.b64encode(content).decode('ascii')
+        }
+    
+    @staticmethod
+    def _attachment_payload(file_path):
+        """
+        Build the fileAttachment payload for a local file.
+        
+        Args:
+            file_path (str): Path to the file to attach
+            
+        Returns:
+            dict: Attachment payload for the Graph attachments endpoint
+        """
+        try:
+            file = open(file_path, 'rb')
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
+        
+        # Encode straight from a memory map of the file, so its bytes aren't
+        # copied into a separate buffer first (empty files can't be mapped)
+        with file:
+            if os.fstat(file.fileno()).st_size:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    content_bytes = pybase64.b64encode(content).decode('ascii')
+            else:
+                content_bytes = ""
+        
+        # Get file name
+        file_name = os.path.basename(file_path)
+        
+        # Create attachment payload
+        return {
+            "@odata.type": "#microsoft.graph.fileAttachment",
+            "name": file_name,
+            "contentBytes": content_bytes
+        }
+    
+    def send_email(self, subject, body, recipients, is_html=False, attachments=None):
+        """
+        Create and send an email directly.
+        
+        Args:
+            subject (str): Email subject
+            body (str): Email body content
+            recipients (list): List of recipient email addresses
+            is_html (bool): Whether the body content is HTML
+            attachments (list): List of file paths to attach
+            
+        Returns:
+            dict: JSON response indicating success
+        """
+        # If there are attachments, create a draft first and then send it
+        if attachments:
+            draft = self.create_draft_email(subject, body, recipients, is_html, attachments)
+            return self.send_draft(draft['id'])
+        
+        message = {"message": self.message_payload(subject, body, recipients, is_html)}
+        
+        endpoint = "/me/sendMail"
+        response = self._request("POST", endpoint, json=message)
+        return {"status": "sent" if response.status_code == 202 else "failed"}
+    
+    def bulk_send(self, subject, body_template, rows, is_html=False):
+        """
+        Send one templated email per row, batched.
+        
+        The message envelope is built once; each row only fills in its body and
+        recipients, and the sends go out as JSON batches.
+        
+        Args:
+            subject (str): Email subject, shared by every message
+            body_template (str): Body with str.format placeholders for row fields
+            rows (list): Dicts of template fields, each with a "to" list of
+                recipient email addresses
+            is_html (bool): Whether the body content is HTML
+            
+        Returns:
+            list: Dicts indicating success, in the same order as rows
+        """
+        envelope = {"message": {
+            "subject": subject,
+            "body": {"contentType": "HTML" if is_html else "Text", "content": None},
+            "toRecipients": None
+        }}
+        content_type = envelope["message"]["body"]["contentType"]
+        
+        sub_requests = []
+        for row in rows:
+            env = envelope.copy()
+            env["message"] = envelope["message"].copy()
+            env["message"]["body"] = {"contentType": content_type, "content": body_template.format_map(row)}
+            env["message"]["toRecipients"] = format_recipients(row["to"])
+            sub_requests.append({"method": "POST", "url": "/me/sendMail", "body": env})
+        
+        results = self.batch(sub_requests, batch_size=MAILBOX_CONCURRENCY_LIMIT)
+        return [{"status": "sent" if result.get("status") == 202 else "failed"} for result in results]
+    
+    def send_draft(self, message_id):
+        """
+        Send an existing draft message.
+        
+        Args:
+            message_id (str): ID of the draft message
+            
+        Returns:
+            dict: JSON response indicating success
+        """
+        endpoint = f"/me/messages/{message_id}/send"
+        response = self._request("POST", endpoint)
+        return {"status": "sent" if response.status_code == 202 else "failed"}
+    
+    def schedule_email(self, subject, body, recipients, schedule_datetime, is_html=False, attachments=None):
+        """
+        Create a draft email and schedule it to be sent at a specific time.
+        Note: This uses the draft approach as Microsoft Graph doesn't directly support scheduled sending.
+        
+        Args:
+            subject (str): Email subject
+            body (str): Email body content
+            recipients (list): List of recipient email addresses
+            schedule_datetime (datetime): When to send the email
+            is_html (bool): Whether the body content is HTML
+            attachments (list): List of file paths to attach
+            
+        Returns:
+            dict: Information about the scheduled email
+        """
+        # Add scheduling information to the subject for demonstration
+        scheduled_subject = f"[Scheduled for {schedule_datetime.strftime('%Y-%m-%d %H:%M')}] {subject}"
+        
+        # Create the draft
+        draft = self.create_draft_email(scheduled_subject, body, recipients, is_html, attachments)
+        
+        # In a real implementation, you would use an external scheduler like Airflow
+        # to trigger the sending at the specified time
+        return {
+            "message_id": draft['id'],
+            "subject": draft['subject'],
+            "scheduled_for": schedule_datetime.isoformat(),
+            "status": "scheduled"
+        }
+    
+    def close(self):
+        """Close the HTTP client and credential, e.g. on Airflow task teardown."""
+        self._client.close()
+        self.credential.close()
+        
+        if OutlookEmailManager._shared is self:
+            OutlookEmailManager._shared = None
+
+
+def get_email_manager(client_id=None, tenant_id=None, client_secret=None):
+    """
+    Return a shared OutlookEmailManager, creating it on first use.
+    
+    Reusing one manager keeps its credential, pooled session and cached token
+    across calls, instead of paying for that setup on every task or request.
+    The credentials are only used when the manager is created; once it is
+    closed, the next call builds a fresh one.
+    
+    Args:
+        client_id (str): Azure AD application client ID
+        tenant_id (str): Azure AD tenant ID
+        client_secret (str): Azure AD application client secret
+        
+    Returns:
+        OutlookEmailManager: The shared manager
+    """
+    if OutlookEmailManager._shared is None:
+        OutlookEmailManager._shared = OutlookEmailManager(
+            client_id=client_id,
+            tenant_id=tenant_id,
+            client_secret=client_secret
+        )
+    return OutlookEmailManager._shared
+
+
+class AsyncOutlookEmailManager:
+    def __init__(self, client_id=None, tenant_id=None, client_secret=None, gzip_requests=False):
+        """
+        Initialize an asyncio-based Outlook Email Manager.
+        
+        Calls are awaited on one shared HTTP client, so many Graph requests can be
+        in flight at once without threads. Use it as an async context manager, or
+        call close() when done.
         
         Args:
             client_id (str): Azure AD application client ID
             tenant_id (str): Azure AD tenant ID
             client_secret (str): Azure AD application client secret
+            gzip_requests (bool): Whether to gzip-compress large JSON request bodies
         """
-        # Use provided credentials or try to get from environment variables
-        self.client_id = client_id or os.getenv("MS_GRAPH_CLIENT_ID")
-        self.tenant_id = tenant_id or os.getenv("MS_GRAPH_TENANT_ID")
-        self.client_secret = client_secret or os.getenv("MS_GRAPH_CLIENT_SECRET")
+        # Use provided credentials or fall back to config.ini and environment variables
+        self.client_id, self.tenant_id, self.client_secret = resolve_credentials(
+            client_id, tenant_id, client_secret
+        )
         
-        if not all([self.client_id, self.tenant_id, self.client_secret]):
-            raise ValueError("Missing required authentication credentials")
+        # Initialize the credential object, sharing cached tokens with sync managers
+        self.credential = AsyncCachedTokenCredential(
+            AsyncClientSecretCredential(
+                tenant_id=self.tenant_id,
+                client_id=self.client_id,
+                client_secret=self.client_secret
+            ),
+            self.tenant_id,
+            self.client_id
+        )
         
-        # Initialize the credential object
-        self.credential = ClientSecretCredential(
-            tenant_id=self.tenant_id,
-            client_id=self.client_id,
-            client_secret=self.client_secret
+        # One HTTP/2 client for every call, so concurrent requests are multiplexed
+        # as streams over a few reused connections instead of opening new ones
+        self._client = httpx.AsyncClient(
+            base_url=GRAPH_BASE_URL,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=MAILBOX_CONCURRENCY_LIMIT,
+                max_keepalive_connections=MAILBOX_CONCURRENCY_LIMIT
+            )
         )
         
-        # Initialize the Graph client
-        self.graph_client = GraphClient(credential=self.credential)
+        # Keeps requests within Graph's per-mailbox limits, shared with every other manager
+        self._mailbox = _mailbox_bucket(self.tenant_id, self.client_id)
+        self.gzip_requests = gzip_requests
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
     
-    def get_inbox_messages(self, top=10, filter_string=None):
+    async def _headers(self):
+        """Return the Authorization header for a Graph request."""
+        token = await self.credential.get_token(GRAPH_SCOPE)
+        return {"Authorization": f"Bearer {token.token}"}
+    
+    async def get_inbox_messages(self, top=10, filter_string=None, select=DEFAULT_MESSAGE_FIELDS):
         """
         Get messages from the user's inbox with optional filtering.
         
         Args:
             top (int): Number of messages to retrieve
             filter_string (str): OData filter string
+            select (tuple): Message fields to return; include "body" to get
+                message bodies, or pass None for every field
             
         Returns:
             dict: JSON response containing messages
         """
-        endpoint = f"/me/mailFolders/inbox/messages?$top={top}"
+        endpoint = OutlookEmailManager._inbox_endpoint(top, filter_string, select)
         
-        if filter_string:
-            endpoint += f"&$filter={filter_string}"
+        return await self._get_page(endpoint)
+    
+    async def iter_inbox_messages(self, page_size=50, filter_string=None, select=DEFAULT_MESSAGE_FIELDS):
+        """
+        Iterate over every inbox message, prefetching the next page.
+        
+        The request for page k+1 is started before the messages of page k are
+        yielded, so the server prepares it while the caller works.
+        
+        Args:
+            page_size (int): Number of messages per request
+            filter_string (str): OData filter string
+            select (tuple): Message fields to return; include "body" to get
+                message bodies, or pass None for every field
             
-        response = self.graph_client.get(endpoint)
-        return response.json()
+        Yields:
+            dict: One message at a time
+        """
+        endpoint = OutlookEmailManager._inbox_endpoint(page_size, filter_string, select)
+        page = await self._get_page(endpoint)
+        
+        while page is not None:
+            next_link = page.get("@odata.nextLink")
+            next_page = asyncio.create_task(self._get_page(next_link)) if next_link else None
+            try:
+                for message in page.get("value", []):
+                    yield message
+            except BaseException:
+                # Stop the prefetch if the caller stops iterating early
+                if next_page:
+                    next_page.cancel()
+                raise
+            page = await next_page if next_page else None
     
-    def create_draft_email(self, subject, body, recipients, is_html=False, attachments=None):
+    async def _post(self, endpoint, payload=None):
+        """
+        POST to the Graph API, serializing any JSON payload with orjson.
+        
+        Args:
+            endpoint (str): Path relative to the API version
+            payload (dict): JSON body, if any
+            
+        Returns:
+            httpx.Response: The HTTP response
+        """
+        if payload is None:
+            return await self._send("POST", endpoint)
+        
+        body, headers = _json_body(payload, self.gzip_requests)
+        return await self._send("POST", endpoint, content=body, headers=headers)
+    
+    async def _get_page(self, url):
+        """Fetch one page of a collection as JSON."""
+        response = await self._send("GET", url)
+        return orjson.loads(response.content)
+    
+    async def _send(self, method, url, headers=None, **kwargs):
+        """
+        Send a Graph request, retrying throttled and failed responses.
+        
+        Args:
+            method (str): HTTP method
+            url (str): Path relative to the API version, or an absolute URL
+            headers (dict): Extra request headers
+            **kwargs: Passed through to httpx.AsyncClient.request
+            
+        Returns:
+            httpx.Response: The HTTP response
+        """
+        headers = dict(headers or {})
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            headers.update(await self._headers())
+            async with self._mailbox.reserve_async(len(kwargs.get("content") or b"")):
+                response = await self._client.request(method, url, headers=headers, **kwargs)
+            if not _should_retry(method, response.status_code) or attempt == MAX_ATTEMPTS:
+                return response
+            await asyncio.sleep(_retry_delay(attempt, response.headers.get("Retry-After")))
+    
+    async def create_draft_email(self, subject, body, recipients, is_html=False, attachments=None):
         """
         Create a draft email in the user's drafts folder.
         
@@ -77,32 +1255,39 @@ class OutlookEmailManager:
         Returns:
             dict: JSON response containing the created message
         """
-        # Format recipients
-        to_recipients = [{"emailAddress": {"address": email}} for email in recipients]
-        
-        # Create message payload
-        message = {
-            "subject": subject,
-            "body": {
-                "contentType": "HTML" if is_html else "Text",
-                "content": body
-            },
-            "toRecipients": to_recipients
-        }
+        message = OutlookEmailManager.message_payload(subject, body, recipients, is_html)
         
         # Create the draft message
-        endpoint = "/me/messages"
-        response = self.graph_client.post(endpoint, json=message)
-        created_message = response.json()
+        created_message = await self.create_draft(message)
         
-        # Add attachments if provided
+        # Add attachments concurrently
         if attachments and created_message.get('id'):
-            for attachment_path in attachments:
+            await asyncio.gather(*[
                 self.add_attachment(created_message['id'], attachment_path)
+                for attachment_path in attachments
+            ])
         
         return created_message
     
-    def add_attachment(self, message_id, file_path):
+    async def create_draft(self, message):
+        """
+        Create a draft from a prebuilt message resource.
+        
+        Args:
+            message (dict): Message payload, e.g. from OutlookEmailManager.message_payload();
+                may include small attachments inline
+            
+        Returns:
+            dict: JSON response containing the created message
+            
+        Raises:
+            httpx.HTTPStatusError: If Graph rejects the request
+        """
+        response = await self._post("/me/messages", message)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    async def add_attachment(self, message_id, file_path):
         """
         Add an attachment to an existing message.
         
@@ -113,31 +1298,113 @@ class OutlookEmailManager:
         Returns:
             dict: JSON response containing the attachment info
         """
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
-        
-        # Read file content
-        with open(file_path, 'rb') as file:
-            content = file.read()
+        file_size = OutlookEmailManager._attachment_size(file_path)
         
-        # Get file name and encode content
-        file_name = os.path.basename(file_path)
-        import base64
-        content_bytes = base64.b64encode(content).decode('utf-8')
+        # Large files are streamed in raw chunks rather than base64-encoded in memory
+        if file_size > INLINE_ATTACHMENT_LIMIT:
+            return await self._upload_attachment(message_id, file_path, file_size)
         
-        # Create attachment payload
-        attachment = {
-            "@odata.type": "#microsoft.graph.fileAttachment",
-            "name": file_name,
-            "contentBytes": content_bytes
-        }
+        attachment = OutlookEmailManager._attachment_payload(file_path)
         
         # Add attachment to message
         endpoint = f"/me/messages/{message_id}/attachments"
-        response = self.graph_client.post(endpoint, json=attachment)
-        return response.json()
+        response = await self._post(endpoint, attachment)
+        return orjson.loads(response.content)
     
-    def send_email(self, subject, body, recipients, is_html=False, attachments=None):
+    async def add_attachment_bytes(self, message_id, file_name, content):
+        """
+        Add in-memory content as an attachment to an existing message.
+        
+        Args:
+            message_id (str): ID of the message
+            file_name (str): Name of the attachment
+            content (bytes): Content of the file to attach
+            
+        Returns:
+            dict: JSON response containing the attachment info
+            
+        Raises:
+            httpx.HTTPStatusError: If Graph rejects the request
+        """
+        # Large content is sent in raw chunks rather than base64-encoded
+        if len(content) > INLINE_ATTACHMENT_LIMIT:
+            return await self._upload_stream(message_id, file_name, len(content), io.BytesIO(content))
+        
+        endpoint = f"/me/messages/{message_id}/attachments"
+        response = await self._post(endpoint, OutlookEmailManager.bytes_attachment_payload(file_name, content))
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    
+    async def _upload_attachment(self, message_id, file_path, file_size):
+        """
+        Attach a large file through an upload session, one chunk at a time.
+        
+        Args:
+            message_id (str): ID of the message
+            file_path (str): Path to the file to attach
+            file_size (int): Size of the file in bytes
+            
+        Returns:
+            dict: Name and size of the uploaded attachment
+        """
+        with open(file_path, 'rb') as file:
+            return await self._upload_stream(message_id, os.path.basename(file_path), file_size, file)
+    
+    async def _upload_stream(self, message_id, file_name, file_size, file):
+        """
+        Attach the content of a binary file object through an upload session.
+        
+        Args:
+            message_id (str): ID of the message
+            file_name (str): Name of the attachment
+            file_size (int): Size of the content in bytes
+            file: Binary file object positioned at the start of the content
+            
+        Returns:
+            dict: Name and size of the uploaded attachment
+        """
+        endpoint = f"/me/messages/{message_id}/attachments/createUploadSession"
+        payload = OutlookEmailManager._upload_session_payload(file_name, file_size)
+        
+        response = await self._post(endpoint, payload)
+        response.raise_for_status()
+        upload_url = orjson.loads(response.content)["uploadUrl"]
+        
+        # The upload URL is pre-authorized and must not be sent a bearer token
+        offset = 0
+        while True:
+            chunk = file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            await self._put_chunk(upload_url, chunk, offset, file_size)
+            offset += len(chunk)
+        
+        return {"name": file_name, "size": file_size}
+    
+    async def _put_chunk(self, upload_url, chunk, offset, file_size):
+        """
+        PUT one upload session chunk, retrying it like any other Graph request.
+        
+        Args:
+            upload_url (str): Pre-authorized upload session URL
+            chunk (bytes): Chunk content
+            offset (int): Position of the chunk in the file
+            file_size (int): Size of the whole file in bytes
+            
+        Returns:
+            httpx.Response: The HTTP response
+        """
+        headers = {"Content-Range": f"bytes {offset}-{offset + len(chunk) - 1}/{file_size}"}
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            async with self._mailbox.reserve_async(len(chunk)):
+                response = await self._client.put(upload_url, content=chunk, headers=headers)
+            if not _should_retry("PUT", response.status_code) or attempt == MAX_ATTEMPTS:
+                break
+            await asyncio.sleep(_retry_delay(attempt, response.headers.get("Retry-After")))
+        response.raise_for_status()
+        return response
+    
+    async def send_email(self, subject, body, recipients, is_html=False, attachments=None):
         """
         Create and send an email directly.
         
@@ -153,29 +1420,15 @@ class OutlookEmailManager:
         """
         # If there are attachments, create a draft first and then send it
         if attachments:
-            draft = self.create_draft_email(subject, body, recipients, is_html, attachments)
-            return self.send_draft(draft['id'])
+            draft = await self.create_draft_email(subject, body, recipients, is_html, attachments)
+            return await self.send_draft(draft['id'])
         
-        # Format recipients
-        to_recipients = [{"emailAddress": {"address": email}} for email in recipients]
-        
-        # Create message payload
-        message = {
-            "message": {
-                "subject": subject,
-                "body": {
-                    "contentType": "HTML" if is_html else "Text",
-                    "content": body
-                },
-                "toRecipients": to_recipients
-            }
-        }
+        message = {"message": OutlookEmailManager.message_payload(subject, body, recipients, is_html)}
         
-        endpoint = "/me/sendMail"
-        response = self.graph_client.post(endpoint, json=message)
+        response = await self._post("/me/sendMail", message)
         return {"status": "sent" if response.status_code == 202 else "failed"}
     
-    def send_draft(self, message_id):
+    async def send_draft(self, message_id):
         """
         Send an existing draft message.
         
@@ -186,39 +1439,25 @@ class OutlookEmailManager:
             dict: JSON response indicating success
         """
         endpoint = f"/me/messages/{message_id}/send"
-        response = self.graph_client.post(endpoint)
+        response = await self._post(endpoint)
         return {"status": "sent" if response.status_code == 202 else "failed"}
     
-    def schedule_email(self, subject, body, recipients, schedule_datetime, is_html=False, attachments=None):
+    async def send_many(self, messages):
         """
-        Create a draft email and schedule it to be sent at a specific time.
-        Note: This uses the draft approach as Microsoft Graph doesn't directly support scheduled sending.
+        Send several emails concurrently.
         
         Args:
-            subject (str): Email subject
-            body (str): Email body content
-            recipients (list): List of recipient email addresses
-            schedule_datetime (datetime): When to send the email
-            is_html (bool): Whether the body content is HTML
-            attachments (list): List of file paths to attach
+            messages (list): Dicts of send_email keyword arguments
             
         Returns:
-            dict: Information about the scheduled email
+            list: send_email results, in the same order as messages
         """
-        # Add scheduling information to the subject for demonstration
-        scheduled_subject = f"[Scheduled for {schedule_datetime.strftime('%Y-%m-%d %H:%M')}] {subject}"
-        
-        # Create the draft
-        draft = self.create_draft_email(scheduled_subject, body, recipients, is_html, attachments)
-        
-        # In a real implementation, you would use an external scheduler like Airflow
-        # to trigger the sending at the specified time
-        return {
-            "message_id": draft['id'],
-            "subject": draft['subject'],
-            "scheduled_for": schedule_datetime.isoformat(),
-            "status": "scheduled"
-        }
+        return await asyncio.gather(*[self.send_email(**message) for message in messages])
+    
+    async def close(self):
+        """Close the HTTP client and credential."""
+        await self._client.aclose()
+        await self.credential.close()
 
 
 def load_config(config_file='config.ini'):
@@ -248,7 +1487,7 @@ def main():
     config = load_config()
     
     if config:
-        email_manager = OutlookEmailManager(
+        email_manager = get_email_manager(
             client_id=config['client_id'],
             tenant_id=config['tenant_id'],
             client_secret=config['client_secret']
@@ -256,47 +1495,52 @@ def main():
     else:
         # Use environment variables
         try:
-            email_manager = OutlookEmailManager()
+            email_manager = get_email_manager()
             print("Using credentials from environment variables")
         except ValueError as e:
             print(f"Error: {e}")
             print("\nPlease set up your credentials using microsoft_graph_config.py")
             return
     
-    # Example 1: Get recent inbox messages
+    # Examples 1 and 2: Get recent inbox messages and create a draft email with
+    # HTML content, sent together as one batch request
+    html_body = """
+    <h2>Test HTML Email</h2>
+    <p>This is a <strong>formatted</strong> email created using Microsoft Graph API.</p>
+    <ul>
+        <li>Item 1</li>
+        <li>Item 2</li>
+        <li>Item 3</li>
+    </ul>
+    <p>This demonstrates HTML formatting capabilities.</p>
+    """
+    
     try:
-        print("\nGetting recent inbox messages...")
-        messages = email_manager.get_inbox_messages(top=5)
+        print("\nGetting recent inbox messages and creating a draft email with HTML content...")
+        inbox_result, draft_result = email_manager.batch([
+            {"method": "GET", "url": "/me/mailFolders/inbox/messages?$top=5&$select=subject,from"},
+            {
+                "method": "POST",
+                "url": "/me/messages",
+                "body": email_manager.message_payload(
+                    subject="HTML Test Email from Python",
+                    body=html_body,
+                    recipients=["recipient@example.com"],
+                    is_html=True
+                )
+            }
+        ])
+        
+        messages = inbox_result.get('body', {})
         print(f"Found {len(messages.get('value', []))} messages")
         
         for idx, msg in enumerate(messages.get('value', []), 1):
             print(f"{idx}. Subject: {msg.get('subject')} - From: {msg.get('from', {}).get('emailAddress', {}).get('address')}")
-    except Exception as e:
-        print(f"Error getting inbox messages: {e}")
-    
-    # Example 2: Create a draft email with HTML content
-    try:
-        print("\nCreating a draft email with HTML content...")
-        html_body = """
-        <h2>Test HTML Email</h2>
-        <p>This is a <strong>formatted</strong> email created using Microsoft Graph API.</p>
-        <ul>
-            <li>Item 1</li>
-            <li>Item 2</li>
-            <li>Item 3</li>
-        </ul>
-        <p>This demonstrates HTML formatting capabilities.</p>
-        """
-        
-        draft = email_manager.create_draft_email(
-            subject="HTML Test Email from Python",
-            body=html_body,
-            recipients=["recipient@example.com"],
-            is_html=True
-        )
+        
+        draft = draft_result.get('body', {})
         print(f"Draft created with ID: {draft.get('id')}")
     except Exception as e:
-        print(f"Error creating draft email: {e}")
+        print(f"Error running batch request: {e}")
     
     # Example 3: Schedule an email (demonstration only)
     try:
@@ -313,6 +1557,8 @@ def main():
     except Exception as e:
         print(f"Error scheduling email: {e}")
     
+    email_manager.close()
+    
     print("\nExamples completed.")
     print("\nNote: In a real implementation, scheduled emails would be sent using a task scheduler like Airflow.")
 
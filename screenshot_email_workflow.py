@@ -6,13 +6,24 @@ and draft emails with those screenshots using Microsoft Graph API.
 """
 
 import os
-import json
+import io
+import asyncio
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
+from types import MappingProxyType
 from datetime import datetime
 from dotenv import load_dotenv
-from azure.identity import ClientSecretCredential
-from msgraph.core import GraphClient
-from composer_browser_automation import ComposerBrowserAutomation
+from PIL import Image
+from composer_browser_automation import ComposerBrowserAutomation, SCREENSHOT_FORMATS
+from microsoft_graph_email_operations import (
+    AsyncOutlookEmailManager,
+    OutlookEmailManager,
+    GRAPH_SCOPE,
+    INLINE_ATTACHMENT_LIMIT,
+    format_recipients
+)
 
 # Load environment variables from .env file (if exists)
 load_dotenv()
@@ -24,23 +35,83 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# PNG screenshots wider than this are scaled down before they are attached
+SCREENSHOT_MAX_WIDTH = 1600
+
+# Default HTML body for DAG run report emails; $-placeholders are filled from the run details
+DEFAULT_BODY_TEMPLATE = Template("""
+<h2>DAG Run Report</h2>
+<p>Please find attached the screenshot of the latest DAG run for <strong>${dag_id}</strong>.</p>
+
+<h3>Run Details:</h3>
+<ul>
+    <li><strong>Run ID:</strong> ${run_id}</li>
+    <li><strong>Run Type:</strong> ${run_type}</li>
+    <li><strong>Execution Date:</strong> ${execution_date}</li>
+    <li><strong>Start Date:</strong> ${start_date}</li>
+    <li><strong>End Date:</strong> ${end_date}</li>
+    <li><strong>Status:</strong> ${status}</li>
+</ul>
+
+<p>This report was automatically generated at ${timestamp}.</p>
+""")
+
+# Placeholder values for run details missing from run_info
+DEFAULT_RUN_DETAILS = MappingProxyType({
+    'run_id': 'N/A',
+    'run_type': 'N/A',
+    'execution_date': 'N/A',
+    'start_date': 'N/A',
+    'end_date': 'N/A',
+    'status': 'N/A'
+})
+
+
 class ScreenshotEmailWorkflow:
-    def __init__(self):
-        """Initialize the screenshot and email workflow."""
-        # Microsoft Graph API credentials
-        self.client_id = os.getenv("MS_GRAPH_CLIENT_ID")
-        self.tenant_id = os.getenv("MS_GRAPH_TENANT_ID")
-        self.client_secret = os.getenv("MS_GRAPH_CLIENT_SECRET")
+    def __init__(self, config=None):
+        """
+        Initialize the screenshot and email workflow.
+        
+        Args:
+            config (dict): Settings as built by main.load_config; if not provided,
+                settings are read from environment variables
+        """
+        if config:
+            # Microsoft Graph API credentials
+            self.client_id = config.get('ms_graph_client_id')
+            self.tenant_id = config.get('ms_graph_tenant_id')
+            self.client_secret = config.get('ms_graph_client_secret')
+            
+            # Composer settings
+            self.composer_url = config.get('composer_url')
+            self.dag_id = config.get('dag_id')
+            
+            # Email settings
+            self.email_recipients = [r.strip() for r in config.get('email_recipients') or [] if r.strip()]
+        else:
+            # Microsoft Graph API credentials
+            self.client_id = os.getenv("MS_GRAPH_CLIENT_ID")
+            self.tenant_id = os.getenv("MS_GRAPH_TENANT_ID")
+            self.client_secret = os.getenv("MS_GRAPH_CLIENT_SECRET")
+            
+            # Composer settings
+            self.composer_url = os.getenv("COMPOSER_URL")
+            self.dag_id = os.getenv("DAG_ID")
+            
+            # Email settings
+            self.email_recipients = [r.strip() for r in os.getenv("EMAIL_RECIPIENTS", "").split(",") if r.strip()]
         
-        # Composer settings
-        self.composer_url = os.getenv("COMPOSER_URL")
-        self.dag_id = os.getenv("DAG_ID")
+        # Screenshots are kept in memory; set SCREENSHOT_DEBUG_DUMP to also write them to disk
+        self.dump_screenshots = os.getenv("SCREENSHOT_DEBUG_DUMP", "").lower() in ("1", "true", "yes")
         
-        # Email settings
-        self.email_recipients = os.getenv("EMAIL_RECIPIENTS", "").split(",")
+        # Graph doesn't document compressed request bodies, so gzip is opt-in
+        self.gzip_requests = os.getenv("GRAPH_GZIP_REQUESTS", "").lower() in ("1", "true", "yes")
+        
+        # Recipients are the same for every draft, so their payload is built once
+        self._to_recipients = format_recipients(self.email_recipients)
         
         # Initialize components
-        self.graph_client = None
+        self.email_manager = None
         self.browser_automation = None
         
         # Validate required settings
@@ -69,15 +140,22 @@ class ScreenshotEmailWorkflow:
     def initialize_graph_client(self):
         """Initialize the Microsoft Graph API client."""
         try:
-            # Initialize the credential object
-            credential = ClientSecretCredential(
-                tenant_id=self.tenant_id,
+            email_manager = OutlookEmailManager(
                 client_id=self.client_id,
-                client_secret=self.client_secret
+                tenant_id=self.tenant_id,
+                client_secret=self.client_secret,
+                gzip_requests=self.gzip_requests
             )
             
-            # Initialize the Graph client
-            self.graph_client = GraphClient(credential=credential)
+            # Fetch the token now (or reuse one cached by an earlier run), so the
+            # Azure AD exchange happens during setup
+            try:
+                email_manager.credential.get_token(GRAPH_SCOPE)
+            except Exception:
+                email_manager.close()
+                raise
+            
+            self.email_manager = email_manager
             logger.info("Microsoft Graph API client initialized successfully")
             return True
         except Exception as e:
@@ -85,192 +163,345 @@ class ScreenshotEmailWorkflow:
             return False
     
     def initialize_browser_automation(self, headless=True):
-        """Initialize the browser automation for Composer."""
+        """
+        Initialize the browser automation for Composer.
+        
+        Uses the process-wide logged-in browser from
+        ComposerBrowserAutomation.get_shared(), so a later workflow in the same
+        process skips the Chrome start-up and Composer login.
+        
+        Args:
+            headless (bool): Whether to run the browser in headless mode
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
         try:
-            self.browser_automation = ComposerBrowserAutomation(headless=headless)
-            success = self.browser_automation.setup_driver()
-            if success:
-                logger.info("Browser automation initialized successfully")
-            return success
+            self.browser_automation = ComposerBrowserAutomation.get_shared(self.composer_url, headless=headless)
+            if not self.browser_automation:
+                logger.error("Failed to set up the browser or login to Composer")
+                return False
+            logger.info("Browser automation initialized successfully")
+            return True
         except Exception as e:
             logger.error(f"Error initializing browser automation: {e}")
             return False
     
-    def capture_dag_run_screenshots(self, status_filter=None, date_range=None):
+    def initialize_components(self, headless=True):
+        """
+        Initialize the Graph client and browser automation concurrently.
+        
+        The Azure AD token exchange and the Chrome start-up are independent, so
+        running them side by side takes about as long as the slower of the two.
+        
+        Args:
+            headless (bool): Whether to run the browser in headless mode
+            
+        Returns:
+            tuple: (graph_ok, browser_ok) booleans
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            graph_future = executor.submit(self.initialize_graph_client)
+            browser_future = executor.submit(self.initialize_browser_automation, headless=headless)
+            return graph_future.result(), browser_future.result()
+    
+    def capture_dag_run_screenshots(self, status_filter=None, date_range=None, dag_id=None):
         """
         Capture screenshots of DAG runs with optional filtering.
         
         Args:
             status_filter (str): Filter by run status (e.g., 'success', 'failed')
             date_range (str): Filter by date range
+            dag_id (str): DAG to capture (defaults to the configured DAG_ID)
             
         Returns:
-            tuple: (screenshot_path, run_info) or (None, None) if failed
+            tuple: (screenshot_bytes, run_info) or (None, None) if failed
         """
         if not self.browser_automation:
             logger.error("Browser automation not initialized")
             return None, None
         
+        dag_id = dag_id or self.dag_id
+        
         try:
-            # Login to Composer
-            if not self.browser_automation.login_to_composer(self.composer_url):
-                logger.error("Failed to login to Composer")
-                return None, None
-            
             # Navigate to DAG runs
-            if not self.browser_automation.navigate_to_dag_runs(self.dag_id):
-                logger.error(f"Failed to navigate to DAG runs for {self.dag_id}")
+            if not self.browser_automation.navigate_to_dag_runs(dag_id):
+                logger.error(f"Failed to navigate to DAG runs for {dag_id}")
                 return None, None
             
             # Apply filters if provided
             if status_filter or date_range:
                 self.browser_automation.filter_dag_runs(status=status_filter, date_range=date_range)
             
-            # Take a screenshot of the filtered DAG runs
-            screenshot_path = self.browser_automation.take_screenshot("dag_runs")
+            # Take a screenshot of the filtered DAG runs, kept in memory for the attachment
+            screenshot = self.browser_automation.take_screenshot_bytes()
+            if screenshot and self.browser_automation.screenshot_format == 'png':
+                screenshot = self._shrink_png(screenshot)
+            
+            if screenshot and self.dump_screenshots:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                dump_path = os.path.join(
+                    self.browser_automation.screenshots_dir,
+                    f"{dag_id}_dag_runs_{timestamp}.{self._screenshot_extension()}"
+                )
+                with open(dump_path, 'wb') as f:
+                    f.write(screenshot)
+                logger.info(f"Screenshot saved to {dump_path}")
             
-            # Get information about the last DAG run
-            run_info = self.browser_automation.get_last_dag_run()
+            # Get information about the last DAG run, scraping the page if the REST API is unavailable
+            run_info = (self.browser_automation.get_last_dag_run_api(dag_id, status=status_filter)
+                        or self.browser_automation.get_last_dag_run())
             
-            return screenshot_path, run_info
+            return screenshot, run_info
         except Exception as e:
             logger.error(f"Error capturing DAG run screenshots: {e}")
             return None, None
-        finally:
-            # Don't close the browser here, as we might need it for more operations
-            pass
     
-    def draft_email_with_screenshot(self, screenshot_path, run_info, subject=None, body_template=None):
+    def _shrink_png(self, screenshot):
+        """
+        Scale a PNG screenshot down to SCREENSHOT_MAX_WIDTH and recompress it.
+        
+        DAG pages are mostly flat colour and text, so an optimized re-encode is
+        usually much smaller than the browser's PNG. JPEG and WebP captures are
+        already compressed and are left alone.
+        
+        Args:
+            screenshot (bytes): PNG image
+            
+        Returns:
+            bytes: The smaller of the re-encoded and the original image
+        """
+        try:
+            with Image.open(io.BytesIO(screenshot)) as img:
+                if img.width > SCREENSHOT_MAX_WIDTH:
+                    img.thumbnail((SCREENSHOT_MAX_WIDTH, img.height), Image.LANCZOS)
+                out = io.BytesIO()
+                img.save(out, "PNG", optimize=True)
+        except Exception as e:
+            logger.warning(f"Could not recompress screenshot, attaching it as captured: {e}")
+            return screenshot
+        
+        shrunk = out.getvalue()
+        if len(shrunk) >= len(screenshot):
+            return screenshot
+        
+        logger.info(f"Screenshot recompressed from {len(screenshot)} to {len(shrunk)} bytes")
+        return shrunk
+    
+    def capture_many(self, jobs):
+        """
+        Capture screenshots for several DAGs in one browser session.
+        
+        The browser is started and logged in once, then reused for every job,
+        instead of paying for start-up and login per DAG.
+        
+        Args:
+            jobs (list): Dicts with 'dag_id' and optional 'status_filter' and
+                'date_range' keys
+            
+        Returns:
+            list: (screenshot_bytes, run_info) tuples in the same order as jobs,
+                with (None, None) for jobs that failed
+        """
+        return [
+            self.capture_dag_run_screenshots(
+                status_filter=job.get('status_filter'),
+                date_range=job.get('date_range'),
+                dag_id=job['dag_id']
+            )
+            for job in jobs
+        ]
+    
+    def draft_email_with_screenshot(self, screenshot, run_info, subject=None, body_template=None, dag_id=None):
         """
         Draft an email with the DAG run screenshot using Microsoft Graph API.
         
         Args:
-            screenshot_path (str): Path to the screenshot file
+            screenshot (bytes): Screenshot image as returned by capture_dag_run_screenshots
             run_info (dict): Information about the DAG run
             subject (str): Custom email subject
-            body_template (str): Custom email body template
+            body_template (str): Custom email body template with str.format
+                placeholders (defaults to DEFAULT_BODY_TEMPLATE)
+            dag_id (str): DAG the screenshot is for (defaults to the configured DAG_ID)
             
         Returns:
             dict: Created draft message or None if failed
         """
-        if not self.graph_client:
+        if not self.email_manager:
             logger.error("Microsoft Graph API client not initialized")
             return None
         
-        if not screenshot_path or not os.path.exists(screenshot_path):
-            logger.error(f"Screenshot file not found: {screenshot_path}")
+        if not screenshot:
+            logger.error("No screenshot to attach")
             return None
         
+        dag_id = dag_id or self.dag_id
+        
         try:
-            # Generate email subject
-            if not subject:
-                dag_status = run_info.get('status', 'Unknown') if run_info else 'Unknown'
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-                subject = f"DAG Run Report: {self.dag_id} - {dag_status} - {timestamp}"
-            
-            # Generate email body
-            if not body_template:
-                body_template = """
-                <h2>DAG Run Report</h2>
-                <p>Please find attached the screenshot of the latest DAG run for <strong>{dag_id}</strong>.</p>
-                
-                <h3>Run Details:</h3>
-                <ul>
-                    <li><strong>Run ID:</strong> {run_id}</li>
-                    <li><strong>Run Type:</strong> {run_type}</li>
-                    <li><strong>Execution Date:</strong> {execution_date}</li>
-                    <li><strong>Start Date:</strong> {start_date}</li>
-                    <li><strong>End Date:</strong> {end_date}</li>
-                    <li><strong>Status:</strong> {status}</li>
-                </ul>
-                
-                <p>This report was automatically generated at {timestamp}.</p>
-                """
-            
-            # Format the body with run information
-            body_context = {
-                'dag_id': self.dag_id,
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'run_id': 'N/A',
-                'run_type': 'N/A',
-                'execution_date': 'N/A',
-                'start_date': 'N/A',
-                'end_date': 'N/A',
-                'status': 'N/A'
-            }
-            
-            if run_info:
-                body_context.update(run_info)
+            message, file_name, inline_attachment = self._build_draft(screenshot, run_info, dag_id, subject, body_template)
+            
+            # Create the draft message
+            created_message = self.email_manager.create_draft(message)
             
+            # Add a large screenshot through an upload session
+            if not inline_attachment:
+                self.email_manager.add_attachment_bytes(created_message['id'], file_name, screenshot)
+            
+            logger.info(f"Draft email created with subject: {message['subject']}")
+            return created_message
+        except Exception as e:
+            logger.error(f"Error drafting email: {e}")
+            return None
+    
+    def _build_draft(self, screenshot, run_info, dag_id, subject=None, body_template=None):
+        """
+        Build the draft message payload for a DAG run screenshot.
+        
+        Args:
+            screenshot (bytes): Screenshot image
+            run_info (dict): Information about the DAG run
+            dag_id (str): DAG the screenshot is for
+            subject (str): Custom email subject
+            body_template (str): Custom email body template
+            
+        Returns:
+            tuple: (message, attachment file name, whether the screenshot is inline)
+        """
+        # One clock read serves both the subject and the body
+        now = time.localtime()
+        
+        # Generate email subject
+        if not subject:
+            dag_status = run_info.get('status', 'Unknown') if run_info else 'Unknown'
+            timestamp = time.strftime("%Y-%m-%d %H:%M", now)
+            subject = f"DAG Run Report: {dag_id} - {dag_status} - {timestamp}"
+        
+        # Format the body with run information
+        body_context = {
+            **DEFAULT_RUN_DETAILS,
+            'dag_id': dag_id,
+            'timestamp': time.strftime("%Y-%m-%d %H:%M:%S", now),
+            **(run_info or {})
+        }
+        
+        # Custom templates are str.format strings; the default is a prebuilt Template
+        if body_template:
             body = body_template.format(**body_context)
+        else:
+            body = DEFAULT_BODY_TEMPLATE.safe_substitute(body_context)
+        
+        # Create message payload
+        message = {
+            "subject": subject,
+            "body": {
+                "contentType": "HTML",
+                "content": body
+            },
+            "toRecipients": self._to_recipients
+        }
+        
+        # A small screenshot goes inline with the draft, so the message and its
+        # attachment are created in one request instead of two
+        file_name = f"{dag_id}_dag_runs.{self._screenshot_extension()}"
+        inline_attachment = len(screenshot) <= INLINE_ATTACHMENT_LIMIT
+        if inline_attachment:
+            message["attachments"] = [OutlookEmailManager.bytes_attachment_payload(file_name, screenshot)]
+        
+        return message, file_name, inline_attachment
+    
+    async def run_many(self, jobs):
+        """
+        Capture screenshots and draft emails for several DAGs, overlapping the two.
+        
+        Captures run one at a time on a worker thread (the browser is shared), and
+        each finished capture's draft is posted with an AsyncOutlookEmailManager
+        while the next DAG is being rendered. The manager keeps the drafts within
+        the mailbox's throttling limits.
+        
+        Args:
+            jobs (list): Dicts with 'dag_id' and optional 'status_filter' and
+                'date_range' keys
             
-            # Format recipients
-            to_recipients = [{"emailAddress": {"address": email.strip()}} for email in self.email_recipients]
+        Returns:
+            list: Created draft messages in the same order as jobs, with None for
+                jobs that failed
+        """
+        if not self.email_manager:
+            logger.error("Microsoft Graph API client not initialized")
+            return [None] * len(jobs)
+        
+        async with AsyncOutlookEmailManager(
+            client_id=self.client_id,
+            tenant_id=self.tenant_id,
+            client_secret=self.client_secret,
+            gzip_requests=self.gzip_requests
+        ) as manager:
+            draft_tasks = []
+            for job in jobs:
+                screenshot, run_info = await asyncio.to_thread(
+                    self.capture_dag_run_screenshots,
+                    status_filter=job.get('status_filter'),
+                    date_range=job.get('date_range'),
+                    dag_id=job['dag_id']
+                )
+                
+                if not screenshot or not run_info:
+                    logger.error(f"Failed to capture DAG run screenshots or get run information for {job['dag_id']}")
+                    draft_tasks.append(None)
+                    continue
+                
+                draft_tasks.append(asyncio.create_task(
+                    self._draft_async(manager, screenshot, run_info, job['dag_id'])
+                ))
             
-            # Create message payload
-            message = {
-                "subject": subject,
-                "body": {
-                    "contentType": "HTML",
-                    "content": body
-                },
-                "toRecipients": to_recipients
-            }
+            return [await task if task else None for task in draft_tasks]
+    
+    async def _draft_async(self, manager, screenshot, run_info, dag_id):
+        """
+        Create one draft with its screenshot using the async email manager.
+        
+        Args:
+            manager (AsyncOutlookEmailManager): Manager for Graph API requests
+            screenshot (bytes): Screenshot image
+            run_info (dict): Information about the DAG run
+            dag_id (str): DAG the screenshot is for
             
-            # Create the draft message
-            endpoint = "/me/messages"
-            response = self.graph_client.post(endpoint, json=message)
-            created_message = response.json()
+        Returns:
+            dict: Created draft message or None if failed
+        """
+        try:
+            message, file_name, inline_attachment = self._build_draft(screenshot, run_info, dag_id)
+            created_message = await manager.create_draft(message)
             
-            # Add the screenshot as an attachment
-            self.add_attachment_to_message(created_message['id'], screenshot_path)
+            # Add a large screenshot through an upload session
+            if not inline_attachment:
+                await manager.add_attachment_bytes(created_message['id'], file_name, screenshot)
             
-            logger.info(f"Draft email created with subject: {subject}")
+            logger.info(f"Draft email created with subject: {message['subject']}")
             return created_message
         except Exception as e:
-            logger.error(f"Error drafting email: {e}")
+            logger.error(f"Error drafting email for {dag_id}: {e}")
             return None
     
-    def add_attachment_to_message(self, message_id, file_path):
+    def add_attachment_to_message(self, message_id, file_bytes, file_name):
         """
         Add an attachment to an existing message.
         
         Args:
             message_id (str): ID of the message
-            file_path (str): Path to the file to attach
+            file_bytes (bytes): Content of the file to attach
+            file_name (str): Name of the attachment
             
         Returns:
             dict: Attachment info or None if failed
         """
-        if not self.graph_client:
+        if not self.email_manager:
             logger.error("Microsoft Graph API client not initialized")
             return None
         
-        if not os.path.exists(file_path):
-            logger.error(f"File not found: {file_path}")
-            return None
-        
         try:
-            # Read file content
-            with open(file_path, 'rb') as file:
-                content = file.read()
-            
-            # Get file name and encode content
-            file_name = os.path.basename(file_path)
-            import base64
-            content_bytes = base64.b64encode(content).decode('utf-8')
-            
-            # Create attachment payload
-            attachment = {
-                "@odata.type": "#microsoft.graph.fileAttachment",
-                "name": file_name,
-                "contentBytes": content_bytes
-            }
-            
-            # Add attachment to message
-            endpoint = f"/me/messages/{message_id}/attachments"
-            response = self.graph_client.post(endpoint, json=attachment)
-            attachment_info = response.json()
+            # Large files go through an upload session rather than inline base64
+            attachment_info = self.email_manager.add_attachment_bytes(message_id, file_name, file_bytes)
             
             logger.info(f"Attachment added to message: {file_name}")
             return attachment_info
@@ -278,6 +509,10 @@ class ScreenshotEmailWorkflow:
             logger.error(f"Error adding attachment: {e}")
             return None
     
+    def _screenshot_extension(self):
+        """Return the file extension for the browser's configured screenshot format."""
+        return SCREENSHOT_FORMATS[self.browser_automation.screenshot_format][0]
+    
     def send_email(self, message_id):
         """
         Send a draft email.
@@ -288,19 +523,18 @@ class ScreenshotEmailWorkflow:
         Returns:
             bool: True if successful, False otherwise
         """
-        if not self.graph_client:
+        if not self.email_manager:
             logger.error("Microsoft Graph API client not initialized")
             return False
         
         try:
-            endpoint = f"/me/messages/{message_id}/send"
-            response = self.graph_client.post(endpoint)
-            success = response.status_code == 202
+            result = self.email_manager.send_draft(message_id)
+            success = result["status"] == "sent"
             
             if success:
                 logger.info(f"Email sent successfully")
             else:
-                logger.error(f"Failed to send email: {response.status_code}")
+                logger.error(f"Failed to send email: {result['status']}")
             
             return success
         except Exception as e:
@@ -309,9 +543,15 @@ class ScreenshotEmailWorkflow:
     
     def cleanup(self):
         """Clean up resources."""
+        # The shared browser stays open for the next workflow; it is closed at exit
+        # (or by ComposerBrowserAutomation.close_shared())
         if self.browser_automation:
-            self.browser_automation.close()
-            logger.info("Browser automation resources cleaned up")
+            self.browser_automation = None
+            logger.info("Browser automation released")
+        
+        if self.email_manager:
+            self.email_manager.close()
+            self.email_manager = None
 
 
 def main():
@@ -321,43 +561,45 @@ def main():
     
     try:
         # Initialize components
-        if not workflow.initialize_graph_client():
+        graph_ok, browser_ok = workflow.initialize_components(headless=False)
+        
+        if not graph_ok:
             logger.error("Failed to initialize Microsoft Graph API client")
             return
         
-        if not workflow.initialize_browser_automation(headless=False):
+        if not browser_ok:
             logger.error("Failed to initialize browser automation")
             return
         
-        # Capture DAG run screenshots with filtering
-        screenshot_path, run_info = workflow.capture_dag_run_screenshots(
-            status_filter="success",  # Filter for successful runs
-            date_range=None  # No date range filter
-        )
-        
-        if not screenshot_path or not run_info:
-            logger.error("Failed to capture DAG run screenshots or get run information")
-            return
+        # DAG_IDS may hold a comma-separated list; all DAGs share one logged-in browser
+        dag_ids = [d.strip() for d in os.getenv("DAG_IDS", "").split(",") if d.strip()] or [workflow.dag_id]
+        jobs = [{'dag_id': dag_id, 'status_filter': "success"} for dag_id in dag_ids]
         
-        # Draft an email with the screenshot
-        draft_message = workflow.draft_email_with_screenshot(screenshot_path, run_info)
+        # Capture DAG run screenshots with filtering, drafting each email while
+        # the next screenshot is captured
+        drafts = []
+        for job, draft_message in zip(jobs, asyncio.run(workflow.run_many(jobs))):
+            if not draft_message:
+                logger.error(f"Failed to draft email for {job['dag_id']}")
+                continue
+            
+            print(f"\nDraft email created with subject: {draft_message['subject']}")
+            print(f"Message ID: {draft_message['id']}")
+            drafts.append(draft_message)
         
-        if not draft_message:
-            logger.error("Failed to draft email")
+        if not drafts:
             return
         
-        print(f"\nDraft email created with subject: {draft_message['subject']}")
-        print(f"Message ID: {draft_message['id']}")
-        
-        # Ask if the user wants to send the email
-        send_email = input("\nDo you want to send the email? (y/n): ")
+        # Ask if the user wants to send the emails
+        send_email = input(f"\nDo you want to send the {len(drafts)} email(s)? (y/n): ")
         if send_email.lower() == 'y':
-            if workflow.send_email(draft_message['id']):
-                print("Email sent successfully")
-            else:
-                print("Failed to send email")
+            for draft_message in drafts:
+                if workflow.send_email(draft_message['id']):
+                    print(f"Email sent successfully: {draft_message['subject']}")
+                else:
+                    print(f"Failed to send email: {draft_message['subject']}")
         else:
-            print("Email saved as draft")
+            print("Emails saved as drafts")
     
     finally:
         # Clean up